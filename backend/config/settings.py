@@ -30,6 +30,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Nur aktiv mit PLANTS_INSTRUMENTATION=True, misst sonst nichts
+    'plants.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -73,6 +75,41 @@ DATABASES = {
     }
 }
 
+# Cache
+# Local-Memory reicht auch für mehrere Gunicorn-Worker, die Änderungsstände
+# für die Invalidierung liegen in der Datenbank (plants/cache.py). Ein
+# gemeinsamer Cache teilt zusätzlich die Einträge zwischen den Workern, z.B.
+# CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+# CACHE_LOCATION=/var/tmp/garden_tracker_cache
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='garden-tracker'),
+    }
+}
+
+# Maximale Lebensdauer versionierter Cache-Einträge (Sekunden)
+PLANTS_CACHE_TIMEOUT = config('PLANTS_CACHE_TIMEOUT', default=300, cast=int)
+
+# Serverseitiger Cache für list/retrieve-Antworten der API
+PLANTS_RESPONSE_CACHE = config('PLANTS_RESPONSE_CACHE', default=True, cast=bool)
+
+# Lebensdauer der Auswahllisten unter /api/lookup/ (Sekunden); der Key
+# enthält den Änderungsstand von Pflanzen und Zyklen
+PLANTS_LOOKUP_CACHE_TIMEOUT = config('PLANTS_LOOKUP_CACHE_TIMEOUT', default=86400, cast=int)
+
+# Aufgaben beim Anlegen von Events automatisch erzeugen (plants/task_rules.py)
+PLANTS_AUTO_TASKS = config('PLANTS_AUTO_TASKS', default=True, cast=bool)
+
+# Query-Anzahl und Laufzeiten pro Request messen (Server-Timing-Header,
+# /api/dashboard/request_stats/)
+PLANTS_INSTRUMENTATION = config('PLANTS_INSTRUMENTATION', default=False, cast=bool)
+
+# /api/sync/: Überlappung des Zeitfensters (Sekunden) und Aufbewahrung der
+# Löschvermerke (Tage); ältere Sync-Tokens bekommen wieder alle Daten
+PLANTS_SYNC_OVERLAP = config('PLANTS_SYNC_OVERLAP', default=60, cast=int)
+PLANTS_SYNC_RETENTION_DAYS = config('PLANTS_SYNC_RETENTION_DAYS', default=90, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
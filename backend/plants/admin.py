@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Plant, PlantingCycle, Event, Task
+from .models import Plant, PlantingCycle, Event, EventRollup, Task
 
 
 class PlantingCycleInline(admin.TabularInline):
@@ -119,11 +119,11 @@ class TaskAdmin(admin.ModelAdmin):
         'title',
         'planting_cycle',
         'due_date',
-        'priority',
+        'priority_column',
         'completed',
         'completed_at'
     ]
-    list_filter = ['completed', 'priority', 'due_date']
+    list_filter = ['completed', 'priority', 'due_date', 'rule']
     search_fields = ['title', 'description', 'planting_cycle__plant__name']
     date_hierarchy = 'due_date'
     actions = ['mark_completed', 'mark_incomplete']
@@ -139,24 +139,43 @@ class TaskAdmin(admin.ModelAdmin):
             'fields': ('completed', 'completed_at')
         }),
         ('Meta', {
-            'fields': ('created_at',),
+            'fields': ('source_event', 'rule', 'rule_step', 'created_at'),
             'classes': ('collapse',)
         }),
     )
-    readonly_fields = ['created_at', 'completed_at']
+    readonly_fields = ['created_at', 'completed_at', 'source_event', 'rule', 'rule_step']
 
     def mark_completed(self, request, queryset):
         """Aufgaben als erledigt markieren"""
-        updated = queryset.update(completed=True)
+        updated = queryset.complete()
         self.message_user(request, f'{updated} Aufgabe(n) als erledigt markiert.')
     mark_completed.short_description = 'Als erledigt markieren'
 
     def mark_incomplete(self, request, queryset):
         """Aufgaben als nicht erledigt markieren"""
-        updated = queryset.update(completed=False, completed_at=None)
+        updated = queryset.uncomplete()
         self.message_user(request, f'{updated} Aufgabe(n) als nicht erledigt markiert.')
     mark_incomplete.short_description = 'Als nicht erledigt markieren'
 
+    def priority_column(self, obj):
+        """Priorität, sortiert nach Rang statt alphabetisch"""
+        return obj.get_priority_display()
+    priority_column.short_description = 'Priorität'
+    priority_column.admin_order_field = 'priority_rank'
+
+
+@admin.register(EventRollup)
+class EventRollupAdmin(admin.ModelAdmin):
+    list_display = ['plant', 'event_type', 'year', 'month', 'event_count', 'total_quantity']
+    list_filter = ['event_type', 'year']
+    search_fields = ['plant__name', 'plant__variety']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 
 # Admin-Site Anpassungen
 admin.site.site_header = 'Gartenpflanzen Tracker'
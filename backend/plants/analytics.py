@@ -0,0 +1,188 @@
+"""
+Auswertungen über Ereignisse (Ernte, Gießen, ...).
+
+Die Summen werden nicht live über alle Events berechnet, sondern in
+EventRollup pro Pflanze, Ereignistyp und Monat vorgehalten. Bei jeder
+Änderung eines Events wird nur der betroffene Monat neu berechnet, beim
+Löschen oder Umhängen eines Zyklus die ganze Pflanze (siehe signals.py);
+rebuild_rollups() baut alles neu auf.
+"""
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear, TruncMonth, TruncWeek
+
+from .cache import bump_data_version
+from .models import Event, EventRollup, PlantingCycle
+
+
+def event_bucket(event, plant_id=None):
+    """(plant_id, event_type, year, month) eines Events"""
+    event_date = Event._meta.get_field('event_date').to_python(event.event_date)
+    if plant_id is None:
+        plant_id = (
+            PlantingCycle.objects
+            .filter(pk=event.planting_cycle_id)
+            .values_list('plant_id', flat=True)
+            .first()
+        )
+    return (plant_id, event.event_type, event_date.year, event_date.month)
+
+
+def refresh_buckets(buckets):
+    """Summen der angegebenen Monate aus den Events neu berechnen"""
+    for plant_id, event_type, year, month in set(buckets):
+        if plant_id is None:
+            continue
+        start = date(year, month, 1)
+        end = date(year + month // 12, month % 12 + 1, 1)
+        totals = Event.objects.filter(
+            planting_cycle__plant_id=plant_id,
+            event_type=event_type,
+            event_date__gte=start,
+            event_date__lt=end
+        ).aggregate(event_count=Count('id'), total_quantity=Sum('quantity'))
+
+        lookup = {'plant_id': plant_id, 'event_type': event_type, 'year': year, 'month': month}
+        if totals['event_count']:
+            EventRollup.objects.update_or_create(
+                **lookup,
+                defaults={
+                    'event_count': totals['event_count'],
+                    'total_quantity': totals['total_quantity'] or 0,
+                }
+            )
+        else:
+            EventRollup.objects.filter(**lookup).delete()
+
+
+def refresh_for_events(events):
+    """Summen für neu angelegte Events aktualisieren (z.B. nach bulk_create)"""
+    cycle_ids = {event.planting_cycle_id for event in events}
+    plants = dict(PlantingCycle.objects.filter(pk__in=cycle_ids).values_list('id', 'plant_id'))
+    refresh_buckets(event_bucket(event, plants.get(event.planting_cycle_id)) for event in events)
+
+
+@transaction.atomic
+def rebuild_rollups(plant_ids=None):
+    """
+    Summen mit einer Aggregat-Query über Event neu aufbauen, alle oder nur
+    die der Pflanzen in plant_ids (z.B. nach dem Löschen eines Zyklus)
+    """
+    events = Event.objects.all()
+    rollups = EventRollup.objects.all()
+    if plant_ids is not None:
+        events = events.filter(planting_cycle__plant_id__in=plant_ids)
+        rollups = rollups.filter(plant_id__in=plant_ids)
+    rows = (
+        events
+        .order_by()
+        .values(
+            'event_type',
+            plant_id=F('planting_cycle__plant_id'),
+            year=ExtractYear('event_date'),
+            month=ExtractMonth('event_date'),
+        )
+        .annotate(event_count=Count('id'), total_quantity=Sum('quantity'))
+    )
+    rollups.delete()
+    rollups = [
+        EventRollup(
+            plant_id=row['plant_id'],
+            event_type=row['event_type'],
+            year=row['year'],
+            month=row['month'],
+            event_count=row['event_count'],
+            total_quantity=row['total_quantity'] or 0,
+        )
+        for row in rows.iterator()
+    ]
+    EventRollup.objects.bulk_create(rollups, batch_size=500)
+    # Einzelne Monate (refresh_buckets) ändern sich nur mit einem Event, das
+    # den Stand von Event erneuert; ein Neuaufbau kann auch Summen reparieren
+    bump_data_version(EventRollup)
+    return len(rollups)
+
+
+# Gruppierungen für den Analytics-Endpoint: Name -> Felder bzw. Aliase
+GROUPINGS = {
+    'plant': ['plant_id', ('plant_name', F('plant__name')), ('plant_variety', F('plant__variety'))],
+    'variety': [('plant_name', F('plant__name')), ('plant_variety', F('plant__variety'))],
+    'year': ['year'],
+    'month': ['month'],
+}
+
+
+def rollup_totals(group_by, event_types=None, year=None, plant=None):
+    """Summen aus EventRollup, gruppiert nach group_by und Ereignistyp"""
+    queryset = EventRollup.objects.all()
+    if event_types:
+        queryset = queryset.filter(event_type__in=event_types)
+    if year:
+        queryset = queryset.filter(year=year)
+    if plant:
+        queryset = queryset.filter(plant_id=plant)
+
+    fields, aliases = ['event_type'], {}
+    for grouping in group_by:
+        for field in GROUPINGS[grouping]:
+            if isinstance(field, tuple):
+                aliases[field[0]] = field[1]
+            else:
+                fields.append(field)
+
+    return (
+        queryset
+        .values(*fields, **aliases)
+        .annotate(event_count=Sum('event_count'), total_quantity=Sum('total_quantity'))
+        .order_by(*fields, *aliases)
+    )
+
+
+# Zeiträume für die Timeline: Name -> Ausdruck für den Periodenbeginn
+TIMELINE_BUCKETS = {
+    'day': F('event_date'),
+    'week': TruncWeek('event_date'),
+    'month': TruncMonth('event_date'),
+}
+
+EVENT_TYPE_LABELS = dict(Event.EVENT_TYPE_CHOICES)
+
+
+def event_timeline(queryset, bucket):
+    """
+    Events nach Zeitraum und Ereignistyp zusammengefasst.
+
+    Eine GROUP BY-Query über das (bereits gefilterte) Event-Queryset,
+    sortiert nach Zeitraum. Ergebnis pro Zeitraum mit den Summen je Typ.
+    """
+    rows = (
+        queryset
+        .order_by()
+        .annotate(period=TIMELINE_BUCKETS[bucket])
+        .values('period', 'event_type')
+        .annotate(
+            event_count=Count('id'),
+            total_quantity=Sum('quantity'),
+            first_date=Min('event_date'),
+            last_date=Max('event_date'),
+        )
+        .order_by('period', 'event_type')
+    )
+
+    periods = []
+    for row in rows:
+        if not periods or periods[-1]['period'] != row['period']:
+            periods.append({'period': row['period'], 'event_count': 0, 'types': []})
+        period = periods[-1]
+        period['event_count'] += row['event_count']
+        period['types'].append({
+            'event_type': row['event_type'],
+            'event_type_display': EVENT_TYPE_LABELS.get(row['event_type'], row['event_type']),
+            'event_count': row['event_count'],
+            'total_quantity': row['total_quantity'],
+            'first_date': row['first_date'],
+            'last_date': row['last_date'],
+        })
+    return periods
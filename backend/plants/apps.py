@@ -5,3 +5,6 @@ class PlantsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'plants'
     verbose_name = 'Gartenpflanzen'
+
+    def ready(self):
+        from . import signals  # noqa: F401
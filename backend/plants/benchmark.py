@@ -0,0 +1,275 @@
+"""
+Synthetische Gartendaten und Benchmark der API.
+
+seed_garden() legt per bulk_create realistische Mengen an Pflanzen, Zyklen,
+Events und Tasks an (Aussaat im Frühjahr, Auspflanzen im Mai, Gießen im
+Sommer, Ernte ab Juli, ...). Der Zufallsgenerator ist mit seed festgelegt,
+gleiche Parameter ergeben also dieselben Daten.
+
+run_benchmark() ruft jede GET-Route aus plants/urls.py (list, retrieve,
+Detail-Actions wie cycles_detail, dashboard/stats, Filter-Varianten) mit
+dem Django-Testclient auf und misst Laufzeit, Query-Anzahl, Antwortgröße
+und den Spitzenwert des Speichers (tracemalloc). Response-Cache und
+Dashboard-Cache werden vor jedem Aufruf geleert, gemessen wird also immer
+die tatsächliche Arbeit.
+"""
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.permissions import IsAdminUser
+
+from .bulk_writes import ALL, after_bulk_write
+from .models import Plant, PlantingCycle, Event, Task
+
+PLANT_NAMES = {
+    'Tomate': ['Ochsenherz', 'Cherry', 'San Marzano', 'Green Zebra', 'Black Krim'],
+    'Paprika': ['California Wonder', 'Spitzpaprika', 'Chili Jalapeño'],
+    'Gurke': ['Einlegegurke', 'Schlangengurke', 'Mini'],
+    'Zucchini': ['Black Beauty', 'Gelb', 'Rond de Nice'],
+    'Bohne': ['Buschbohne', 'Stangenbohne', 'Feuerbohne'],
+    'Salat': ['Lollo Rosso', 'Eichblatt', 'Kopfsalat'],
+    'Kürbis': ['Hokkaido', 'Butternut', 'Muskat'],
+    'Möhre': ['Nantaise', 'Rodelika', 'Purple Haze'],
+    'Basilikum': ['Genoveser', 'Thai', 'Zitrone'],
+    'Erbse': ['Kleine Rheinländerin', 'Zuckererbse'],
+}
+
+LOCATIONS = ['Fensterbank', 'Topf 9cm', 'Gewächshaus', 'Beet A', 'Beet B', 'Hochbeet']
+
+TASK_TITLES = ['Gießen', 'Düngen', 'Ausgeizen', 'Mulchen', 'Schnecken absammeln', 'Aufbinden']
+
+# Routen mit zusätzlichen Filter-Varianten ({year} = neuestes Anbaujahr)
+ROUTE_VARIANTS = {
+    'plant-list': ['?search=tomate'],
+    'plantingcycle-list': ['?year={year}', '?status=planted_out'],
+    'event-list': ['?type=harvest', '?date_from={year}-06-01&date_to={year}-06-30', '?pagination=cursor'],
+    'event-timeline': ['?bucket=day', '?bucket=month&date_from={year}-01-01'],
+    'task-list': ['?completed=false', '?overdue=true', '?priority=high', '?pagination=cursor'],
+    'task-grouped': ['?groups=done&limit=500'],
+    'analytics-list': ['?group_by=plant,year'],
+}
+
+
+def plant_variants(count, rng):
+    """count eindeutige (Name, Sorte)-Paare"""
+    base = [(name, variety) for name, varieties in PLANT_NAMES.items() for variety in varieties]
+    rng.shuffle(base)
+    variants = []
+    for i in range(count):
+        name, variety = base[i % len(base)]
+        if i >= len(base):
+            variety = f'{variety} {i // len(base) + 1}'
+        variants.append((name, variety))
+    return variants
+
+
+def cycle_events(rng, cycle, year, count):
+    """Events eines Zyklus in zeitlicher Reihenfolge"""
+    sowing = date(year, 3, 1) + timedelta(days=rng.randrange(45))
+    lifecycle = [
+        ('sowing', sowing, 'Fensterbank', None),
+        ('germination', sowing + timedelta(days=rng.randrange(5, 15)), 'Fensterbank', None),
+        ('transplanting', sowing + timedelta(days=rng.randrange(20, 35)), 'Topf 9cm', None),
+        ('planting_out', date(year, 5, 10) + timedelta(days=rng.randrange(25)), 'Beet A', None),
+    ]
+    events = []
+    for event_type, event_date, location, quantity in lifecycle[:count]:
+        events.append(Event(
+            planting_cycle=cycle, event_type=event_type, event_date=event_date,
+            location=location, quantity=quantity
+        ))
+    for _ in range(count - len(events)):
+        event_type = rng.choices(['watering', 'fertilizing', 'harvest', 'pruning', 'other'], [6, 2, 3, 1, 1])[0]
+        if event_type == 'harvest':
+            event_date = date(year, 7, 1) + timedelta(days=rng.randrange(90))
+            quantity = Decimal(rng.randrange(1, 40)) / 10
+        else:
+            event_date = date(year, 5, 1) + timedelta(days=rng.randrange(150))
+            quantity = Decimal(rng.randrange(1, 10)) if event_type == 'watering' else None
+        events.append(Event(
+            planting_cycle=cycle, event_type=event_type, event_date=event_date,
+            location=rng.choice(LOCATIONS), quantity=quantity,
+            notes=rng.choice(['', '', '', 'Blattläuse', 'Mehltau an den unteren Blättern', 'sehr kräftig'])
+        ))
+    return events
+
+
+def cycle_tasks(rng, cycle, year, count, today):
+    tasks = []
+    for _ in range(count):
+        due_date = date(year, 3, 1) + timedelta(days=rng.randrange(240))
+        completed = due_date < today and rng.random() < 0.85
+        priority = rng.choice(['low', 'medium', 'medium', 'high'])
+        tasks.append(Task(
+            planting_cycle=cycle,
+            title=rng.choice(TASK_TITLES),
+            due_date=due_date,
+            priority=priority,
+            priority_rank=Task.PRIORITY_RANKS[priority],
+            completed=completed,
+            completed_at=timezone.now() if completed else None,
+        ))
+    return tasks
+
+
+def cycle_status(year, today):
+    if year < today.year:
+        return 'finished'
+    return 'planted_out' if today.month >= 6 else 'sowing'
+
+
+def seed_garden(plants, years, events_per_cycle, tasks_per_cycle=3, seed=0,
+                batch_size=1000, chunk_size=200, progress=None):
+    """
+    Legt plants Pflanzen mit je years Zyklen (bis zum aktuellen Jahr) an.
+
+    Geschrieben wird blockweise (chunk_size Pflanzen pro Transaktion), der
+    Speicherbedarf hängt also nicht von plants ab. Gibt die Anzahl der
+    angelegten Datensätze zurück.
+    """
+    rng = random.Random(seed)
+    today = timezone.localdate()
+    first_year = today.year - years + 1
+    counts = {'plants': 0, 'cycles': 0, 'events': 0, 'tasks': 0}
+
+    variants = plant_variants(plants, rng)
+    for start in range(0, plants, chunk_size):
+        with transaction.atomic():
+            chunk = [
+                Plant(name=name, variety=variety, seed_source=rng.choice(['', 'Eigene Samen', 'Saatgut-Tausch']))
+                for name, variety in variants[start:start + chunk_size]
+            ]
+            Plant.objects.bulk_create(chunk, batch_size=batch_size)
+            reload_pks(chunk, Plant, ('name', 'variety'))
+
+            cycles = [
+                PlantingCycle(plant=plant, year=year, status=cycle_status(year, today))
+                for plant in chunk
+                for year in range(first_year, today.year + 1)
+            ]
+            PlantingCycle.objects.bulk_create(cycles, batch_size=batch_size)
+            reload_pks(cycles, PlantingCycle, ('plant_id', 'year'))
+
+            events, tasks = [], []
+            for cycle in cycles:
+                events.extend(cycle_events(rng, cycle, cycle.year, events_per_cycle))
+                tasks.extend(cycle_tasks(rng, cycle, cycle.year, tasks_per_cycle, today))
+            Event.objects.bulk_create(events, batch_size=batch_size)
+            Task.objects.bulk_create(tasks, batch_size=batch_size)
+
+        counts['plants'] += len(chunk)
+        counts['cycles'] += len(cycles)
+        counts['events'] += len(events)
+        counts['tasks'] += len(tasks)
+        if progress:
+            progress(counts)
+
+    # Statusangaben sind gewollt, deshalb nur plants=ALL (ohne Status-Abgleich)
+    after_bulk_write((Plant, PlantingCycle, Event, Task), plants=ALL)
+    return counts
+
+
+def reload_pks(objs, model, key_fields):
+    """IDs nach bulk_create nachladen, falls die Datenbank sie nicht liefert (MySQL)"""
+    missing = [obj for obj in objs if obj.pk is None]
+    if not missing:
+        return
+    first = key_fields[0]
+    existing = {
+        tuple(row[1:]): row[0]
+        for row in model.objects.filter(
+            **{f'{first}__in': {getattr(obj, first) for obj in missing}}
+        ).values_list('pk', *key_fields)
+    }
+    for obj in missing:
+        obj.pk = existing[tuple(getattr(obj, field) for field in key_fields)]
+
+
+# --- Messung ------------------------------------------------------------------
+
+def benchmark_routes():
+    """(Name, URL) für alle GET-Routen des Routers, ohne Admin-Routen"""
+    from .urls import router
+
+    year = PlantingCycle.objects.order_by('-year').values_list('year', flat=True).first()
+    routes = []
+    for prefix, viewset, basename in router.registry:
+        model = getattr(getattr(viewset, 'queryset', None), 'model', None)
+        obj_id = model.objects.order_by('pk').values_list('pk', flat=True).first() if model else None
+
+        names = []
+        if hasattr(viewset, 'list'):
+            names.append((f'{basename}-list', False))
+        if hasattr(viewset, 'retrieve'):
+            names.append((f'{basename}-detail', True))
+        for extra in viewset.get_extra_actions():
+            if 'get' not in extra.mapping:
+                continue
+            permissions = extra.kwargs.get('permission_classes') or []
+            if IsAdminUser in permissions:
+                continue
+            names.append((f'{basename}-{extra.url_name}', extra.detail))
+
+        for name, detail in names:
+            if detail and obj_id is None:
+                continue
+            url = reverse(name, kwargs={'pk': obj_id} if detail else None)
+            routes.append((name, url))
+            for variant in ROUTE_VARIANTS.get(name, []):
+                routes.append((name + variant, url + variant.format(year=year)))
+    return routes
+
+
+def measure(client, url, repeat):
+    """Laufzeit (Median, Min, Max), Queries, Bytes und Speicherspitze einer URL"""
+    timings = []
+    queries = size = status_code = None
+    for _ in range(repeat):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = client.get(url)
+            body = b''.join(response.streaming_content) if response.streaming else response.content
+            timings.append((time.perf_counter() - start) * 1000)
+        queries, size, status_code = len(ctx.captured_queries), len(body), response.status_code
+
+    # Speicher getrennt messen, tracemalloc verlangsamt die Ausführung
+    cache.clear()
+    tracemalloc.start()
+    try:
+        response = client.get(url)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'status': status_code,
+        'median_ms': round(statistics.median(timings), 2),
+        'min_ms': round(min(timings), 2),
+        'max_ms': round(max(timings), 2),
+        'queries': queries,
+        'bytes': size,
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def run_benchmark(repeat=5):
+    """Alle Routen gegen die aktuellen Daten messen, {Route: Messwerte}"""
+    client = Client()
+    results = {}
+    with override_settings(PLANTS_RESPONSE_CACHE=False):
+        for name, url in benchmark_routes():
+            results[name] = {'url': url, **measure(client, url, repeat)}
+    return results
@@ -0,0 +1,55 @@
+"""
+Nacharbeiten nach Massenänderungen.
+
+bulk_create() und QuerySet.update() lösen keine Signale aus. Wer damit
+schreibt, ruft danach after_bulk_write() auf; es erledigt dasselbe wie die
+Handler in signals.py (Datenversion, Suchindex, Monatssummen, Status,
+Aufgaben), aber einmal für alle Zeilen.
+"""
+from .analytics import rebuild_rollups, refresh_for_events
+from .cache import bump_data_version
+from .cycle_status import advance_for_events, reconcile_statuses
+from .models import PlantingCycle
+from .search import reindex_cycles, reindex_plants
+from .task_rules import generate_for_events
+
+# Für after_bulk_write: alle Pflanzen bzw. Zyklen neu berechnen
+ALL = 'all'
+
+
+def after_bulk_write(models, events=(), plants=(), cycles=()):
+    """
+    Nacharbeiten, die bulk_create() und update() ohne Signale nicht auslösen.
+
+    - models: geänderte Modelle, deren Datenversion erhöht wird
+    - events: neu angelegte Events; Suchindex, Monatssummen, Status und
+      Aufgaben werden wie bei post_save für diese Events nachgezogen
+    - plants: IDs geänderter Pflanzen (Suchindex, Monatssummen)
+    - cycles: IDs der Zyklen mit neuen Events (Suchindex, Monatssummen,
+      Status aus allen Events des Zyklus)
+
+    Mit ALL für plants bzw. cycles wird alles neu aufgebaut.
+    """
+    for model in models:
+        bump_data_version(model)
+
+    if events:
+        reindex_cycles({event.planting_cycle_id for event in events})
+        refresh_for_events(events)
+        advance_for_events(events)
+        generate_for_events(events)
+
+    if plants == ALL or cycles == ALL:
+        rebuild_rollups()
+        reindex_plants()
+    elif plants or cycles:
+        plant_ids = set(plants) | set(
+            PlantingCycle.objects.filter(pk__in=cycles).values_list('plant_id', flat=True)
+        )
+        rebuild_rollups(plant_ids)
+        reindex_plants(plant_ids)
+
+    if cycles == ALL:
+        reconcile_statuses()
+    elif cycles:
+        reconcile_statuses(cycles)
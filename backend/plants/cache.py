@@ -0,0 +1,69 @@
+"""
+Versionierter Cache für aggregierte API-Antworten.
+
+Jede Änderung an Plant, PlantingCycle, Event oder Task erhöht den
+Änderungsstand des Modells (siehe signals.py). Daraus werden ETag und
+Last-Modified berechnet (conditional.py), gecachte Antworten liegen unter
+dem ETag. Veraltete Einträge werden dadurch nie mehr gelesen und laufen
+aus.
+
+Die Stände liegen in der Tabelle ModelVersion und nicht im Cache: mit
+mehreren Gunicorn-Workern und LocMemCache würde sonst nur der Worker, der
+die Änderung geschrieben hat, den neuen Stand sehen. Die Erhöhung läuft in
+der Transaktion der Änderung und wird mit ihr sichtbar.
+"""
+import time
+
+from django.db.models import F
+from django.utils import timezone
+
+
+def _new_version(label):
+    from .models import ModelVersion
+
+    # Zeitbasierter Startwert, damit eine neu angelegte Zeile (z.B. nach
+    # flush) nicht auf alte Cache-Einträge zurückfällt
+    return ModelVersion(model=label, version=int(time.time() * 1000), changed_at=timezone.now())
+
+
+def bump_data_version(model=None):
+    """
+    Datenversion erhöhen und damit alle versionierten Einträge verwerfen.
+
+    Mit model wird nur dessen Änderungsstand erneuert, sonst der aller
+    Modelle.
+    """
+    from .models import ModelVersion
+
+    if model is not None:
+        touch_model_state(model)
+    else:
+        ModelVersion.objects.update(version=F('version') + 1, changed_at=timezone.now())
+
+
+def touch_model_state(model):
+    """Änderungsstand eines Modells erhöhen (ein UPDATE)"""
+    from .models import ModelVersion
+
+    label = model._meta.label_lower
+    updated = ModelVersion.objects.filter(model=label).update(
+        version=F('version') + 1, changed_at=timezone.now()
+    )
+    if not updated:
+        ModelVersion.objects.bulk_create([_new_version(label)], ignore_conflicts=True)
+
+
+def get_model_states(models):
+    """Änderungsstände (token, timestamp) mehrerer Modelle mit einer Query lesen"""
+    from .models import ModelVersion
+
+    labels = [model._meta.label_lower for model in models]
+    rows = {
+        row.model: row for row in ModelVersion.objects.filter(model__in=labels)
+    }
+    missing = [label for label in labels if label not in rows]
+    if missing:
+        # Unbekannter Stand (leere Tabelle): als geändert behandeln
+        ModelVersion.objects.bulk_create([_new_version(label) for label in missing], ignore_conflicts=True)
+        rows.update((row.model, row) for row in ModelVersion.objects.filter(model__in=missing))
+    return [(str(rows[label].version), rows[label].changed_at.timestamp()) for label in labels]
@@ -0,0 +1,90 @@
+"""
+Conditional GET (ETag / Last-Modified) für die ViewSets.
+
+ETag und Last-Modified werden nur aus den Änderungsständen der
+beteiligten Modelle (siehe cache.py) und der Request-URL berechnet.
+Passt der Stand des Clients, wird 304 zurückgegeben, ohne dass
+Queryset oder Serializer laufen.
+"""
+import hashlib
+from datetime import datetime, time, timezone as dt_timezone
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from .cache import get_model_states
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+    default_detail = ''
+
+
+class ConditionalGetMixin:
+    """
+    ETag/Last-Modified für GET- und HEAD-Requests.
+
+    conditional_models listet alle Modelle, deren Daten in die
+    Antworten des ViewSets einfließen. conditional_actions beschränkt die
+    Prüfung auf einzelne Actions (None = alle), z.B. wenn andere Actions
+    Zähler ausgeben, die sich ohne Datenänderung ändern.
+    """
+    conditional_models = ()
+    conditional_actions = None
+
+    def get_conditional_state(self, request):
+        states = get_model_states(self.conditional_models)
+        # Filter wie "überfällig" und das Dashboard hängen vom Datum ab
+        today = timezone.now().date()
+        day_start = datetime.combine(today, time.min, tzinfo=dt_timezone.utc).timestamp()
+
+        digest = hashlib.md5(usedforsecurity=False)
+        digest.update(request.build_absolute_uri().encode('utf-8'))
+        digest.update(request.accepted_renderer.format.encode('utf-8'))
+        digest.update(today.isoformat().encode('ascii'))
+        for token, _ in states:
+            digest.update(token.encode('ascii'))
+        last_modified = int(max(day_start, *(timestamp for _, timestamp in states)))
+        return quote_etag(digest.hexdigest()), last_modified
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.conditional_state = None
+        if (
+            request.method in ('GET', 'HEAD')
+            and self.conditional_models
+            and (self.conditional_actions is None or self.action in self.conditional_actions)
+        ):
+            etag, last_modified = self.conditional_state = self.get_conditional_state(request)
+            response = get_conditional_response(
+                request._request,
+                etag=etag,
+                last_modified=last_modified
+            )
+            if response is not None and response.status_code == status.HTTP_304_NOT_MODIFIED:
+                raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=self.conditional_headers())
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, 'conditional_state', None) and response.status_code == status.HTTP_200_OK:
+            for header, value in self.conditional_headers().items():
+                response.headers.setdefault(header, value)
+        return response
+
+    def conditional_headers(self):
+        etag, last_modified = self.conditional_state
+        return {
+            'ETag': etag,
+            'Last-Modified': http_date(last_modified),
+            # Browser soll immer revalidieren statt heuristisch zu cachen
+            'Cache-Control': 'no-cache',
+        }
@@ -0,0 +1,106 @@
+"""
+Status eines Anbau-Zyklus aus den erfassten Ereignissen.
+
+Der Status durchläuft die Reihenfolge aus PlantingCycle.STATUS_CHOICES.
+Aussaat, Keimung, Auspflanzen und Ernte setzen den Zyklus auf den
+zugehörigen Status, aber nur vorwärts: ein Zyklus in "Ernte" geht durch ein
+nachgetragenes Aussaat-Event nicht zurück, und manuell gesetzte spätere
+Stufen ("Abgeschlossen") bleiben erhalten.
+
+Die Änderung ist ein einzelnes UPDATE ... WHERE status IN (frühere Stufen),
+der aktuelle Status muss dafür nicht gelesen werden.
+"""
+from django.db.models import Case, IntegerField, Max, Value, When
+from django.utils import timezone
+
+from .cache import bump_data_version
+from .models import Event, PlantingCycle
+
+# Ereignistyp -> Status, den der Zyklus mindestens erreicht
+EVENT_STATUS = {
+    'sowing': 'sowing',
+    'germination': 'germinating',
+    'planting_out': 'planted_out',
+    'harvest': 'harvesting',
+}
+
+STATUS_ORDER = [status for status, _ in PlantingCycle.STATUS_CHOICES]
+STATUS_RANK = {status: rank for rank, status in enumerate(STATUS_ORDER)}
+
+UPDATE_BATCH_SIZE = 500
+
+
+def statuses_before(status):
+    """Alle Status, die vor status liegen"""
+    return STATUS_ORDER[:STATUS_RANK[status]]
+
+
+def advance_cycles(targets):
+    """
+    Zyklen auf den Zielstatus vorrücken, targets = {cycle_id: status}.
+
+    Ein UPDATE je Zielstatus (und Block von Zyklen). Gibt die Anzahl
+    geänderter Zyklen zurück.
+    """
+    by_status = {}
+    for cycle_id, status in targets.items():
+        by_status.setdefault(status, []).append(cycle_id)
+
+    updated = 0
+    now = timezone.now()
+    for status, cycle_ids in by_status.items():
+        for start in range(0, len(cycle_ids), UPDATE_BATCH_SIZE):
+            updated += PlantingCycle.objects.filter(
+                pk__in=cycle_ids[start:start + UPDATE_BATCH_SIZE],
+                status__in=statuses_before(status)
+            ).update(status=status, updated_at=now)
+    # update() löst keine post_save Signale aus und setzt updated_at nicht
+    if updated:
+        bump_data_version(PlantingCycle)
+    return updated
+
+
+def advance_for_events(events):
+    """Status der Zyklen zu gespeicherten Events vorrücken"""
+    targets = {}
+    for event in events:
+        status = EVENT_STATUS.get(event.event_type)
+        if status is None:
+            continue
+        current = targets.get(event.planting_cycle_id)
+        if current is None or STATUS_RANK[status] > STATUS_RANK[current]:
+            targets[event.planting_cycle_id] = status
+    return advance_cycles(targets)
+
+
+def derived_statuses(cycle_ids=None):
+    """
+    Höchster Status aus den Events je Zyklus, {cycle_id: status}.
+
+    Eine Aggregat-Query über Event, gruppiert nach Zyklus.
+    """
+    rank = Case(
+        *[When(event_type=event_type, then=Value(STATUS_RANK[status]))
+          for event_type, status in EVENT_STATUS.items()],
+        output_field=IntegerField()
+    )
+    events = Event.objects.filter(event_type__in=EVENT_STATUS)
+    if cycle_ids is not None:
+        events = events.filter(planting_cycle_id__in=cycle_ids)
+    rows = (
+        events
+        .order_by()
+        .values('planting_cycle_id')
+        .annotate(rank=Max(rank))
+        .values_list('planting_cycle_id', 'rank')
+    )
+    return {cycle_id: STATUS_ORDER[rank] for cycle_id, rank in rows}
+
+
+def reconcile_statuses(cycle_ids=None):
+    """Alle (bzw. die angegebenen) Zyklen auf den Stand ihrer Events bringen"""
+    if cycle_ids is not None:
+        cycle_ids = list(cycle_ids)
+        if not cycle_ids:
+            return 0
+    return advance_cycles(derived_statuses(cycle_ids))
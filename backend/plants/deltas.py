@@ -0,0 +1,64 @@
+"""
+Kompakte Antworten für schreibende Requests (?delta=true).
+
+Statt nach jeder Änderung die komplette Pflanze mit allen Zyklen, Events
+und Tasks neu zu laden, bekommt der Client das geänderte Objekt und die
+neu berechneten Kennzahlen zurück und aktualisiert seinen Zustand selbst:
+
+- cycle: der betroffene Zyklus ohne Events/Tasks, aber mit Status,
+  event_count und task_count
+- plant: cycle_count und der neueste Zyklus (id, year, status) der Pflanze
+
+Ohne delta-Parameter antworten die Endpunkte unverändert.
+"""
+from .models import PlantingCycle
+from .serializers import PlantingCycleSerializer
+from .sparse_fields import FieldSelection
+
+# Zyklus ohne eingebettete Events und Tasks
+COMPACT_CYCLE = FieldSelection(expand=set())
+
+STATUS_LABELS = dict(PlantingCycle.STATUS_CHOICES)
+
+
+def wants_delta(request):
+    return str(request.query_params.get('delta', '')).lower() in ['true', '1', 'yes']
+
+
+def plant_summary(plant_id):
+    """cycle_count und neuester Zyklus einer Pflanze (eine Query)"""
+    cycles = list(
+        PlantingCycle.objects.filter(plant_id=plant_id)
+        .order_by('-year')
+        .values_list('id', 'year', 'status')
+    )
+    latest = cycles[0] if cycles else None
+    return {
+        'id': plant_id,
+        'cycle_count': len(cycles),
+        'latest_cycle_id': latest[0] if latest else None,
+        'latest_cycle_year': latest[1] if latest else None,
+        'latest_cycle_status': latest[2] if latest else None,
+        'latest_cycle_status_display': STATUS_LABELS.get(latest[2]) if latest else None,
+    }
+
+
+def cycle_delta(cycle_id, **changed):
+    """
+    Antwort mit den geänderten Objekten (changed) sowie dem Zyklus und der
+    Pflanze nach der Änderung. cycle_id None (Task ohne Zyklus) liefert
+    cycle und plant als None.
+    """
+    cycle = None
+    if cycle_id is not None:
+        cycle = (
+            PlantingCycle.objects.with_counts()
+            .select_related('plant')
+            .filter(pk=cycle_id)
+            .first()
+        )
+    return {
+        **changed,
+        'cycle': PlantingCycleSerializer(cycle, field_selection=COMPACT_CYCLE).data if cycle else None,
+        'plant': plant_summary(cycle.plant_id) if cycle else None,
+    }
@@ -0,0 +1,81 @@
+"""
+Streaming-Export der kompletten Gartenhistorie.
+
+Die Tabellen werden in der Reihenfolge Plant -> PlantingCycle -> Event/Task
+in Blöcken nach Primärschlüssel gelesen (WHERE id > letzte_id LIMIT n).
+Der Speicherbedarf bleibt dadurch unabhängig von der Datenmenge konstant,
+auch unter MySQL, dessen Standard-Cursor ganze Ergebnismengen puffern.
+"""
+import csv
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Plant, PlantingCycle, Event, Task
+
+# Reihenfolge so, dass referenzierte Zeilen immer vorher kommen
+EXPORT_MODELS = {
+    'plants': Plant,
+    'cycles': PlantingCycle,
+    'events': Event,
+    'tasks': Task,
+}
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class ExportJSONEncoder(DjangoJSONEncoder):
+    """Wie DjangoJSONEncoder, aber Zeitstempel mit voller Genauigkeit"""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def export_columns(model):
+    """Spalten eines Modells (Fremdschlüssel als *_id)"""
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def iter_rows(model, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Alle Zeilen als Tupel, blockweise nach Primärschlüssel gelesen"""
+    columns = export_columns(model)
+    pk_index = columns.index(model._meta.pk.attname)
+    last_pk = None
+    while True:
+        queryset = model.objects.order_by('pk').values_list(*columns)
+        if last_pk is not None:
+            queryset = queryset.filter(pk__gt=last_pk)
+        rows = list(queryset[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        last_pk = rows[-1][pk_index]
+
+
+def iter_ndjson(model_names=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Eine JSON-Zeile pro Datensatz, mit "model" als Typkennung"""
+    for name in model_names or EXPORT_MODELS:
+        model = EXPORT_MODELS[name]
+        columns = export_columns(model)
+        for row in iter_rows(model, chunk_size):
+            record = {'model': name, **dict(zip(columns, row))}
+            yield json.dumps(record, cls=ExportJSONEncoder, ensure_ascii=False) + '\n'
+
+
+class _Echo:
+    """Datei-Ersatz für csv.writer, der die Zeile direkt zurückgibt"""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(model_name, chunk_size=DEFAULT_CHUNK_SIZE):
+    """CSV mit Kopfzeile für ein einzelnes Modell"""
+    model = EXPORT_MODELS[model_name]
+    writer = csv.writer(_Echo())
+    yield writer.writerow(export_columns(model))
+    for row in iter_rows(model, chunk_size):
+        yield writer.writerow(row)
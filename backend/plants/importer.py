@@ -0,0 +1,390 @@
+"""
+Massenimport von Pflanzen, Zyklen, Events und Tasks aus NDJSON oder CSV.
+
+NDJSON entspricht dem Format von export_garden (ein Datensatz pro Zeile,
+Tabelle im Feld "model"); CSV enthält genau eine Tabelle. Referenzen werden
+über Lookup-Tabellen im Speicher aufgelöst, geschrieben wird blockweise mit
+bulk_create innerhalb einer Transaktion.
+
+Referenzen auf Pflanzen und Zyklen, in dieser Reihenfolge:
+
+- plant_id / planting_cycle_id aus derselben Importdatei (z.B. Export einer
+  anderen Installation), sonst eine vorhandene ID in der Datenbank
+- plant_name (+ plant_variety) und für Events/Tasks year (Standard: Jahr
+  von event_date bzw. due_date); fehlende Pflanzen und Zyklen werden dabei
+  angelegt, z.B. beim Abtippen alter Gartennotizen
+
+Bestehende Pflanzen (gleicher Name und Sorte) und Zyklen (gleiche Pflanze
+und Jahr, unique_together) werden wiederverwendet statt doppelt angelegt.
+"""
+import csv
+import io
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.utils import timezone
+
+from .bulk_writes import ALL, after_bulk_write
+from .models import Plant, PlantingCycle, Event, Task
+
+IMPORT_MODELS = {
+    'plants': Plant,
+    'cycles': PlantingCycle,
+    'events': Event,
+    'tasks': Task,
+}
+
+DEFAULT_BATCH_SIZE = 1000
+
+MAX_REPORTED_ERRORS = 100
+
+# Antwort, wenn die Datei nicht als UTF-8 gelesen werden kann
+ENCODING_ERROR = 'Die Datei ist nicht UTF-8-kodiert (z.B. in Excel als "CSV UTF-8" speichern).'
+
+# Ab so vielen betroffenen Pflanzen/Zyklen werden Suchindex und Status komplett neu berechnet
+FULL_REINDEX_THRESHOLD = 500
+
+
+class DryRunRollback(Exception):
+    """Bricht die Transaktion am Ende eines Probelaufs ab"""
+
+
+def read_ndjson(stream, model_name=None):
+    """(Zeilennummer, Tabelle, Datensatz) aus NDJSON-Zeilen"""
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_number, None, {'__error__': f'Ungültiges JSON: {exc}'}
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, {'__error__': 'Erwartet ein JSON-Objekt'}
+            continue
+        yield line_number, record.pop('model', model_name), record
+
+
+def read_csv(stream, model_name):
+    """(Zeilennummer, Tabelle, Datensatz) aus einer CSV-Datei mit Kopfzeile"""
+    for line_number, row in enumerate(csv.DictReader(stream), start=2):
+        yield line_number, model_name, row
+
+
+def open_text(uploaded_file):
+    """Hochgeladene Datei als Text-Stream (UTF-8, BOM wird ignoriert)"""
+    return io.TextIOWrapper(uploaded_file, encoding='utf-8-sig', newline='')
+
+
+class GardenImporter:
+    """Importiert Datensätze in Abhängigkeitsreihenfolge mit bulk_create"""
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, dry_run=False, progress=None):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.progress = progress
+        self.created = {name: 0 for name in IMPORT_MODELS}
+        self.reused = {'plants': 0, 'cycles': 0}
+        self.errors = []
+        self.error_count = 0
+        self.processed = 0
+        self.touched_plants = set()
+        self.touched_cycles = set()
+
+        self.pending_model = None
+        self.pending = []
+        # Schlüssel gepufferter Pflanzen/Zyklen -> weitere Quell-IDs (Duplikate)
+        self.pending_keys = {}
+
+    # --- Lookup-Tabellen --------------------------------------------------
+
+    def load_lookups(self):
+        """Vorhandene Pflanzen und Zyklen einmalig in den Speicher laden"""
+        self.plants_by_key = {
+            (name, variety): pk
+            for pk, name, variety in Plant.objects.values_list('id', 'name', 'variety')
+        }
+        self.plant_ids = set(self.plants_by_key.values())
+        self.cycles_by_key = {
+            (plant_id, year): pk
+            for pk, plant_id, year in PlantingCycle.objects.values_list('id', 'plant_id', 'year')
+        }
+        self.cycle_ids = set(self.cycles_by_key.values())
+        # Quell-ID aus der Importdatei -> ID in dieser Datenbank
+        self.plant_id_map = {}
+        self.cycle_id_map = {}
+
+    # --- Ablauf -------------------------------------------------------------
+
+    def run(self, records):
+        """Importiert alle Datensätze; gibt die Zusammenfassung zurück"""
+        try:
+            with transaction.atomic():
+                self.load_lookups()
+                for line_number, model_name, record in records:
+                    self.add(line_number, model_name, record)
+                self.flush()
+                if self.dry_run:
+                    raise DryRunRollback()
+                self.after_import()
+        except DryRunRollback:
+            pass
+        return self.summary()
+
+    def add(self, line_number, model_name, record):
+        self.processed += 1
+        if '__error__' in record:
+            self.error(line_number, record['__error__'])
+            return
+        if model_name not in IMPORT_MODELS:
+            self.error(line_number, f'Unbekannte Tabelle: {model_name}')
+            return
+
+        # Zyklen brauchen gespeicherte Pflanzen, Events/Tasks gespeicherte Zyklen
+        if model_name != self.pending_model or len(self.pending) >= self.batch_size:
+            self.flush()
+            self.pending_model = model_name
+
+        try:
+            source_id, obj = getattr(self, f'build_{model_name}')(record)
+        except ValidationError as exc:
+            self.error(line_number, '; '.join(self.format_error(exc)))
+            return
+        if obj is not None:
+            self.pending.append((source_id, obj))
+
+    def flush(self):
+        if not self.pending:
+            return
+        model_name, pending = self.pending_model, self.pending
+        getattr(self, f'save_{model_name}')(pending)
+        self.pending = []
+        self.pending_keys = {}
+        self.created[model_name] += len(pending)
+        if self.progress:
+            self.progress(self)
+
+    def after_import(self):
+        """Nacharbeiten, die bulk_create ohne Signale nicht auslöst"""
+        if not any(self.created.values()):
+            return
+        if len(self.touched_plants) + len(self.touched_cycles) > FULL_REINDEX_THRESHOLD:
+            after_bulk_write(IMPORT_MODELS.values(), plants=ALL, cycles=ALL)
+        else:
+            after_bulk_write(IMPORT_MODELS.values(), plants=self.touched_plants, cycles=self.touched_cycles)
+
+    def summary(self):
+        return {
+            'dry_run': self.dry_run,
+            'processed': self.processed,
+            'created': self.created,
+            'reused': self.reused,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+    def error(self, line_number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line_number, 'error': message})
+
+    @staticmethod
+    def format_error(exc):
+        if hasattr(exc, 'message_dict'):
+            return [f'{field}: {" ".join(messages)}' for field, messages in exc.message_dict.items()]
+        return exc.messages
+
+    # --- Datensätze aufbauen ------------------------------------------------
+
+    def build_instance(self, model, record, exclude=()):
+        """Modellinstanz aus den bekannten Feldern des Datensatzes, validiert"""
+        values = {}
+        for field in model._meta.concrete_fields:
+            if field.primary_key or field.is_relation or field.name in exclude:
+                continue
+            if field.name not in record:
+                continue
+            value = record[field.name]
+            # Leere CSV-Zellen zählen als fehlend, damit der Default greift
+            # (z.B. priority); Textfelder ohne Default bleiben leer
+            if value in ('', None) and (
+                field.has_default() or not isinstance(field, (models.CharField, models.TextField))
+            ):
+                continue
+            values[field.attname] = '' if value is None else value
+        instance = model(**values)
+        # Fremdschlüssel sind bereits aufgelöst, unique_together wird per Lookup geprüft
+        instance.full_clean(
+            exclude=[f.name for f in model._meta.concrete_fields if f.is_relation],
+            validate_unique=False,
+            validate_constraints=False
+        )
+        return instance
+
+    def build_plants(self, record):
+        plant = self.build_instance(Plant, record, exclude=('created_at', 'updated_at'))
+        return self.deduplicate(
+            'plants', (plant.name, plant.variety), record.get('id'), plant,
+            self.plants_by_key, self.plant_id_map
+        )
+
+    def build_cycles(self, record):
+        plant_id = self.resolve_plant(record, create=True)
+        cycle = self.build_instance(PlantingCycle, record, exclude=('created_at', 'updated_at'))
+        cycle.plant_id = plant_id
+        self.touched_plants.add(plant_id)
+        return self.deduplicate(
+            'cycles', (plant_id, cycle.year), record.get('id'), cycle,
+            self.cycles_by_key, self.cycle_id_map
+        )
+
+    def deduplicate(self, model_name, key, source_id, obj, existing, id_map):
+        """Vorhandene bzw. bereits gepufferte Datensätze wiederverwenden"""
+        source_id = None if source_id in (None, '') else str(source_id)
+        if key in existing:
+            self.reused[model_name] += 1
+            if source_id is not None:
+                id_map[source_id] = existing[key]
+            return None, None
+        if key in self.pending_keys:
+            self.reused[model_name] += 1
+            if source_id is not None:
+                self.pending_keys[key].append(source_id)
+            return None, None
+        self.pending_keys[key] = []
+        return source_id, obj
+
+    def build_events(self, record):
+        event = self.build_instance(Event, record, exclude=('created_at', 'updated_at'))
+        event.planting_cycle_id = self.resolve_cycle(record, event.event_date, required=True)
+        self.touched_cycles.add(event.planting_cycle_id)
+        return None, event
+
+    def build_tasks(self, record):
+        task = self.build_instance(Task, record, exclude=('created_at', 'updated_at'))
+        task.planting_cycle_id = self.resolve_cycle(record, task.due_date, required=False)
+        if task.completed and not task.completed_at:
+            task.completed_at = timezone.now()
+        elif not task.completed:
+            task.completed_at = None
+        # bulk_create ruft Task.save nicht auf
+        task.priority_rank = Task.PRIORITY_RANKS[task.priority]
+        return None, task
+
+    # --- Referenzen auflösen ------------------------------------------------
+
+    def resolve_plant(self, record, create=False):
+        source_id = record.get('plant_id', record.get('plant'))
+        if source_id not in (None, ''):
+            source_id = str(source_id)
+            if source_id in self.plant_id_map:
+                return self.plant_id_map[source_id]
+            try:
+                if int(source_id) in self.plant_ids and not self.plant_id_map:
+                    return int(source_id)
+            except ValueError:
+                pass
+            raise ValidationError({'plant_id': [f'Pflanze {source_id} nicht gefunden.']})
+
+        name = (record.get('plant_name') or '').strip()
+        if not name:
+            raise ValidationError({'plant_name': ['plant_id oder plant_name angeben.']})
+        key = (name, (record.get('plant_variety') or '').strip())
+        if key not in self.plants_by_key:
+            if not create:
+                raise ValidationError({'plant_name': [f'Pflanze {name} nicht gefunden.']})
+            plant = Plant.objects.create(name=key[0], variety=key[1])
+            self.created['plants'] += 1
+            self.register_plants([(None, plant)])
+        return self.plants_by_key[key]
+
+    def resolve_cycle(self, record, default_date, required):
+        source_id = record.get('planting_cycle_id', record.get('planting_cycle'))
+        if source_id not in (None, ''):
+            source_id = str(source_id)
+            if source_id in self.cycle_id_map:
+                return self.cycle_id_map[source_id]
+            try:
+                if int(source_id) in self.cycle_ids and not self.cycle_id_map:
+                    return int(source_id)
+            except ValueError:
+                pass
+            raise ValidationError({'planting_cycle_id': [f'Zyklus {source_id} nicht gefunden.']})
+
+        if not record.get('plant_name') and not record.get('plant_id'):
+            if required:
+                raise ValidationError({'planting_cycle_id': ['planting_cycle_id oder plant_name angeben.']})
+            return None
+
+        plant_id = self.resolve_plant(record, create=True)
+        year = record.get('year') or (default_date.year if default_date else None)
+        if not year:
+            raise ValidationError({'year': ['Jahr angeben.']})
+        try:
+            key = (plant_id, int(year))
+        except ValueError:
+            raise ValidationError({'year': [f'Ungültiges Jahr: {year}']})
+        if key not in self.cycles_by_key:
+            cycle = PlantingCycle.objects.create(plant_id=plant_id, year=key[1])
+            self.created['cycles'] += 1
+            self.register_cycles([(None, cycle)])
+        self.touched_plants.add(plant_id)
+        return self.cycles_by_key[key]
+
+    # --- Speichern ----------------------------------------------------------
+
+    def save_plants(self, pending):
+        Plant.objects.bulk_create([obj for _, obj in pending], batch_size=self.batch_size)
+        self.register_plants(pending)
+
+    def register_plants(self, pending):
+        missing = [obj for _, obj in pending if obj.pk is None]
+        if missing:
+            # Ohne RETURNING (MySQL) IDs über Name und Sorte nachladen
+            names = {obj.name for obj in missing}
+            self.plants_by_key.update({
+                (name, variety): pk
+                for pk, name, variety in Plant.objects.filter(name__in=names).values_list('id', 'name', 'variety')
+            })
+        for source_id, obj in pending:
+            key = (obj.name, obj.variety)
+            pk = obj.pk or self.plants_by_key[key]
+            self.plants_by_key[key] = pk
+            self.plant_ids.add(pk)
+            self.touched_plants.add(pk)
+            if source_id not in (None, ''):
+                self.plant_id_map[str(source_id)] = pk
+            for alias in self.pending_keys.get(key, ()):
+                self.plant_id_map[alias] = pk
+
+    def save_cycles(self, pending):
+        PlantingCycle.objects.bulk_create([obj for _, obj in pending], batch_size=self.batch_size)
+        self.register_cycles(pending)
+
+    def register_cycles(self, pending):
+        missing = [obj for _, obj in pending if obj.pk is None]
+        if missing:
+            plant_ids = {obj.plant_id for obj in missing}
+            self.cycles_by_key.update({
+                (plant_id, year): pk
+                for pk, plant_id, year in PlantingCycle.objects.filter(
+                    plant_id__in=plant_ids
+                ).values_list('id', 'plant_id', 'year')
+            })
+        for source_id, obj in pending:
+            key = (obj.plant_id, obj.year)
+            pk = obj.pk or self.cycles_by_key[key]
+            self.cycles_by_key[key] = pk
+            self.cycle_ids.add(pk)
+            if source_id not in (None, ''):
+                self.cycle_id_map[str(source_id)] = pk
+            for alias in self.pending_keys.get(key, ()):
+                self.cycle_id_map[alias] = pk
+
+    def save_events(self, pending):
+        Event.objects.bulk_create([obj for _, obj in pending], batch_size=self.batch_size)
+
+    def save_tasks(self, pending):
+        Task.objects.bulk_create([obj for _, obj in pending], batch_size=self.batch_size)
@@ -0,0 +1,186 @@
+"""
+Messung von Queries und Laufzeiten pro Request.
+
+Aktiv mit PLANTS_INSTRUMENTATION=True. Für jeden Request werden Anzahl und
+Dauer der SQL-Queries, die Zeit in den Serializern, die Gesamtdauer und die
+Antwortgröße erfasst und
+
+- als Server-Timing-Header mitgeschickt (sichtbar in den Browser-DevTools)
+- pro Route (URL-Name aus dem Router, z.B. "plant-detail") im Cache
+  aufsummiert, abrufbar unter /api/dashboard/request_stats/
+
+Dieselbe SQL-Anweisung mehrfach in einem Request deutet auf ein N+1-Muster
+hin; solche Anweisungen werden pro Route mit der höchsten Wiederholungszahl
+gemeldet. Bei Streaming-Antworten (Export) laufen die Queries erst nach der
+Middleware und werden nicht mitgezählt. Die Summen werden ohne Sperre im
+Cache aktualisiert und sind bei mehreren Worker-Prozessen Näherungswerte.
+"""
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+ROUTES_KEY = 'plants:request_stats:routes'
+ROUTE_KEY = 'plants:request_stats:route:{}'
+
+# Ab so vielen gleichen Queries in einem Request gilt eine Anweisung als Duplikat
+DUPLICATE_THRESHOLD = 3
+MAX_DUPLICATES = 5
+
+_current = ContextVar('plants_request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Messwerte eines einzelnen Requests"""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        # execute_wrapper: sql enthält Platzhalter statt Werten, gleiche
+        # Anweisungen mit anderen Parametern zählen also zusammen
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def duplicates(self):
+        return {
+            sql: count for sql, count in self.statements.items()
+            if count >= DUPLICATE_THRESHOLD
+        }
+
+
+class TimedSerializerMixin:
+    """Zählt die Zeit in to_representation zur Serializer-Zeit des Requests"""
+
+    def to_representation(self, instance):
+        metrics = _current.get()
+        if metrics is None:
+            return super().to_representation(instance)
+        # Verschachtelte Serializer laufen innerhalb des äußeren mit
+        metrics.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializer_depth -= 1
+            if not metrics.serializer_depth:
+                metrics.serializer_time += time.perf_counter() - start
+
+
+class InstrumentationMiddleware:
+    """Misst jeden Request, siehe Modul-Docstring"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PLANTS_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(metrics):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - start
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics.sql_time * 1000:.1f};desc="{metrics.queries} queries"',
+            f'serializer;dur={metrics.serializer_time * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+        match = request.resolver_match
+        if match is not None and match.url_name:
+            size = None if response.streaming else len(response.content)
+            record(match.url_name, metrics, total, size)
+        return response
+
+
+def record(route, metrics, total, size):
+    """Messwerte eines Requests zu den Summen der Route addieren"""
+    key = ROUTE_KEY.format(route)
+    stats = cache.get(key) or {
+        'requests': 0,
+        'total_ms': 0.0,
+        'max_ms': 0.0,
+        'queries': 0,
+        'max_queries': 0,
+        'sql_ms': 0.0,
+        'serializer_ms': 0.0,
+        'bytes': 0,
+        'sized_requests': 0,
+        'duplicates': {},
+    }
+    stats['requests'] += 1
+    stats['total_ms'] += total * 1000
+    stats['max_ms'] = max(stats['max_ms'], total * 1000)
+    stats['queries'] += metrics.queries
+    stats['max_queries'] = max(stats['max_queries'], metrics.queries)
+    stats['sql_ms'] += metrics.sql_time * 1000
+    stats['serializer_ms'] += metrics.serializer_time * 1000
+    if size is not None:
+        stats['bytes'] += size
+        stats['sized_requests'] += 1
+
+    duplicates = stats['duplicates']
+    for sql, count in metrics.duplicates().items():
+        duplicates[sql] = max(duplicates.get(sql, 0), count)
+    stats['duplicates'] = dict(
+        sorted(duplicates.items(), key=lambda item: item[1], reverse=True)[:MAX_DUPLICATES]
+    )
+    cache.set(key, stats, timeout=None)
+
+    routes = cache.get(ROUTES_KEY) or []
+    if route not in routes:
+        cache.set(ROUTES_KEY, sorted(routes + [route]), timeout=None)
+
+
+def request_stats():
+    """Durchschnitte und Spitzenwerte pro Route"""
+    routes = cache.get(ROUTES_KEY) or []
+    values = cache.get_many([ROUTE_KEY.format(route) for route in routes])
+    report = {}
+    for route in routes:
+        stats = values.get(ROUTE_KEY.format(route))
+        if not stats:
+            continue
+        requests = stats['requests']
+        report[route] = {
+            'requests': requests,
+            'avg_ms': round(stats['total_ms'] / requests, 1),
+            'max_ms': round(stats['max_ms'], 1),
+            'avg_queries': round(stats['queries'] / requests, 1),
+            'max_queries': stats['max_queries'],
+            'avg_sql_ms': round(stats['sql_ms'] / requests, 1),
+            'avg_serializer_ms': round(stats['serializer_ms'] / requests, 1),
+            'avg_bytes': (
+                round(stats['bytes'] / stats['sized_requests'])
+                if stats['sized_requests'] else None
+            ),
+            'duplicate_queries': [
+                {'sql': sql, 'max_per_request': count}
+                for sql, count in stats['duplicates'].items()
+            ],
+        }
+    return report
+
+
+def reset_request_stats():
+    routes = cache.get(ROUTES_KEY) or []
+    cache.delete_many([ROUTE_KEY.format(route) for route in routes] + [ROUTES_KEY])
@@ -0,0 +1,25 @@
+"""
+Kompakte Auswahllisten für Formulare (/api/lookup/).
+
+Eine Zeile pro Zyklus als Tupel statt verschachtelter Serializer-Ausgabe,
+gelesen mit einer einzigen values_list-Query. Pflanzen ohne (passenden)
+Zyklus kommen per LEFT JOIN mit leeren Zyklus-Spalten dazu, damit ein
+Formular auch sie anbieten kann.
+"""
+from django.db.models import F, FilteredRelation, Q
+
+from .models import Plant
+
+COLUMNS = ['id', 'plant', 'plant_name', 'plant_variety', 'year', 'status']
+
+
+def cycle_lookup(year=None):
+    """Tupel (Zyklus-ID, Pflanzen-ID, Name, Sorte, Jahr, Status), nach Pflanze sortiert"""
+    condition = Q(cycles__year=year) if year else Q()
+    rows = (
+        Plant.objects
+        .annotate(cycle=FilteredRelation('cycles', condition=condition))
+        .order_by('name', 'variety', F('cycle__year').desc(nulls_last=True))
+        .values_list('cycle__id', 'id', 'name', 'variety', 'cycle__year', 'cycle__status')
+    )
+    return {'columns': COLUMNS, 'rows': list(rows)}
@@ -0,0 +1,118 @@
+import json
+import os
+import platform
+import time
+
+import django
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from plants.benchmark import run_benchmark, seed_garden
+
+
+class Command(BaseCommand):
+    help = (
+        'Misst Laufzeit, Queries und Speicher aller API-Routen bei verschiedenen '
+        'Datenmengen und schreibt die Ergebnisse als JSON. Läuft in einer eigenen '
+        'Test-Datenbank, die vorhandenen Daten bleiben unberührt.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scales',
+            default='10,100,500',
+            help='Anzahl Pflanzen je Durchlauf, kommagetrennt (Standard: 10,100,500)'
+        )
+        parser.add_argument('--years', type=int, default=3, help='Anbaujahre pro Pflanze')
+        parser.add_argument('--events-per-cycle', type=int, default=20, help='Events pro Zyklus')
+        parser.add_argument('--tasks-per-cycle', type=int, default=3, help='Tasks pro Zyklus')
+        parser.add_argument('--repeat', type=int, default=5, help='Aufrufe pro Route (Median)')
+        parser.add_argument('-o', '--output', help='Ergebnisdatei (Standard: benchmark-<Zeitstempel>.json)')
+        parser.add_argument('--compare', help='Frühere Ergebnisdatei, Abweichungen werden ausgegeben')
+
+    def handle(self, *args, **options):
+        try:
+            scales = [int(scale) for scale in options['scales'].split(',') if scale]
+        except ValueError:
+            raise CommandError('--scales erwartet Zahlen, z.B. 10,100,500')
+        output = options['output'] or f"benchmark-{timezone.now():%Y%m%d-%H%M%S}.json"
+
+        results = {
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'options': {
+                key: options[key]
+                for key in ('years', 'events_per_cycle', 'tasks_per_cycle', 'repeat')
+            },
+            'scales': [],
+        }
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            for plants in scales:
+                call_command('flush', interactive=False, verbosity=0)
+                start = time.perf_counter()
+                counts = seed_garden(
+                    plants,
+                    options['years'],
+                    options['events_per_cycle'],
+                    tasks_per_cycle=options['tasks_per_cycle']
+                )
+                seed_seconds = time.perf_counter() - start
+                self.stdout.write(f"{plants} Pflanzen ({counts['events']} Events) in {seed_seconds:.1f}s angelegt")
+
+                routes = run_benchmark(repeat=options['repeat'])
+                results['scales'].append({
+                    'plants': plants,
+                    'counts': counts,
+                    'seed_seconds': round(seed_seconds, 2),
+                    'routes': routes,
+                })
+                self.print_scale(routes)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        with open(output, 'w', encoding='utf-8') as stream:
+            json.dump(results, stream, indent=2, ensure_ascii=False)
+        self.stdout.write(self.style.SUCCESS(f'Ergebnisse in {output} gespeichert.'))
+
+        if options['compare']:
+            if not os.path.exists(options['compare']):
+                raise CommandError(f"{options['compare']} nicht gefunden.")
+            with open(options['compare'], encoding='utf-8') as stream:
+                self.print_comparison(json.load(stream), results)
+
+    def print_scale(self, routes):
+        for name, result in routes.items():
+            self.stdout.write(
+                f"  {name:55} {result['median_ms']:8.1f} ms {result['queries']:4} q "
+                f"{result['bytes'] / 1024:9.1f} KB {result['peak_memory_kb']:9.1f} KB peak"
+            )
+
+    def print_comparison(self, previous, current):
+        """Routen mit anderer Query-Anzahl oder >20% höherer Laufzeit als im Vergleichslauf"""
+        before = {scale['plants']: scale['routes'] for scale in previous.get('scales', [])}
+        changes = 0
+        for scale in current['scales']:
+            old_routes = before.get(scale['plants'], {})
+            for name, result in scale['routes'].items():
+                old = old_routes.get(name)
+                if old is None:
+                    continue
+                slower = old['median_ms'] and result['median_ms'] > old['median_ms'] * 1.2
+                if result['queries'] != old['queries'] or slower:
+                    changes += 1
+                    self.stdout.write(self.style.WARNING(
+                        f"{scale['plants']:>6} Pflanzen {name}: "
+                        f"{old['queries']} -> {result['queries']} Queries, "
+                        f"{old['median_ms']:.1f} -> {result['median_ms']:.1f} ms"
+                    ))
+        if not changes:
+            self.stdout.write(self.style.SUCCESS('Keine Abweichungen zum Vergleichslauf.'))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from plants.export import DEFAULT_CHUNK_SIZE, EXPORT_MODELS, iter_csv, iter_ndjson
+
+
+class Command(BaseCommand):
+    help = 'Exportiert Pflanzen, Zyklen, Events und Tasks als NDJSON oder CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=['ndjson', 'csv'],
+            default='ndjson',
+            help='Ausgabeformat (Standard: ndjson)'
+        )
+        parser.add_argument(
+            '--model',
+            choices=list(EXPORT_MODELS),
+            action='append',
+            help='Nur diese Tabelle(n) exportieren; bei CSV genau eine'
+        )
+        parser.add_argument(
+            '--output', '-o',
+            help='Zieldatei (Standard: stdout)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Zeilen pro Datenbank-Abfrage'
+        )
+
+    def handle(self, *args, **options):
+        models = options['model']
+        if options['format'] == 'csv':
+            if not models or len(models) != 1:
+                raise CommandError('Für CSV genau ein --model angeben.')
+            lines = iter_csv(models[0], options['chunk_size'])
+        else:
+            lines = iter_ndjson(models, options['chunk_size'])
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
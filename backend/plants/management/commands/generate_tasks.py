@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from plants.task_rules import generate_all
+
+
+class Command(BaseCommand):
+    help = 'Erzeugt fehlende Aufgaben nach den Regeln in plants/task_rules.py für alle aktiven Zyklen'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--include-past',
+            action='store_true',
+            help='Auch Aufgaben anlegen, deren Fälligkeit schon vorbei ist'
+        )
+
+    def handle(self, *args, **options):
+        count = generate_all(include_past=options['include_past'])
+        self.stdout.write(self.style.SUCCESS(f'{count} Aufgabe(n) angelegt.'))
@@ -0,0 +1,76 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from plants.importer import (
+    DEFAULT_BATCH_SIZE,
+    ENCODING_ERROR,
+    IMPORT_MODELS,
+    GardenImporter,
+    read_csv,
+    read_ndjson,
+)
+
+
+class Command(BaseCommand):
+    help = 'Importiert Pflanzen, Zyklen, Events und Tasks aus NDJSON oder CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Importdatei (.ndjson/.jsonl oder .csv)')
+        parser.add_argument(
+            '--format',
+            choices=['ndjson', 'csv'],
+            help='Dateiformat (Standard: anhand der Dateiendung)'
+        )
+        parser.add_argument(
+            '--model',
+            choices=list(IMPORT_MODELS),
+            help='Tabelle der Datensätze; Pflicht bei CSV'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Datensätze pro bulk_create'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Alles prüfen und importieren, am Ende aber zurückrollen'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+        if file_format == 'csv' and not options['model']:
+            raise CommandError('Für CSV --model angeben.')
+
+        importer = GardenImporter(
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+            progress=self.report_progress
+        )
+        with open(path, encoding='utf-8-sig', newline='') as stream:
+            if file_format == 'csv':
+                records = read_csv(stream, options['model'])
+            else:
+                records = read_ndjson(stream, options['model'])
+            try:
+                summary = importer.run(records)
+            except UnicodeDecodeError:
+                raise CommandError(ENCODING_ERROR)
+
+        for error in summary['errors']:
+            self.stderr.write(f"Zeile {error['line']}: {error['error']}")
+        if summary['error_count'] > len(summary['errors']):
+            self.stderr.write(f"... insgesamt {summary['error_count']} Fehler")
+
+        created = ', '.join(f'{count} {name}' for name, count in summary['created'].items())
+        reused = ', '.join(f'{count} {name}' for name, count in summary['reused'].items())
+        message = f"{summary['processed']} Datensätze verarbeitet. Angelegt: {created}. Wiederverwendet: {reused}."
+        if summary['dry_run']:
+            self.stdout.write(self.style.WARNING(f'Probelauf, nichts gespeichert. {message}'))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
+
+    def report_progress(self, importer):
+        created = sum(importer.created.values())
+        self.stdout.write(f'{importer.processed} verarbeitet, {created} angelegt ...')
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from plants.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        'Entfernt Löschvermerke für /api/sync/, die älter als '
+        'PLANTS_SYNC_RETENTION_DAYS sind'
+    )
+
+    def handle(self, *args, **options):
+        count = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} Löschvermerke älter als {settings.PLANTS_SYNC_RETENTION_DAYS} Tage entfernt.'
+        ))
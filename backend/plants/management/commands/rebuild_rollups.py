@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from plants.analytics import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Baut die Monatssummen (EventRollup) für Auswertungen aus allen Events neu auf'
+
+    def handle(self, *args, **options):
+        count = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f'{count} Monatssummen neu aufgebaut.'))
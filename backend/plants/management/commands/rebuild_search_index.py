@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from plants.search import fts_available, reindex_plants
+
+
+class Command(BaseCommand):
+    help = 'Baut den Volltext-Suchindex (SQLite FTS5) für alle Pflanzen neu auf'
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            self.stdout.write(self.style.WARNING('Kein Volltextindex vorhanden, Suche nutzt icontains.'))
+            return
+        reindex_plants()
+        self.stdout.write(self.style.SUCCESS('Suchindex neu aufgebaut.'))
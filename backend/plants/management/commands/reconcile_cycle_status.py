@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from plants.cycle_status import reconcile_statuses
+
+
+class Command(BaseCommand):
+    help = 'Setzt den Status aller Anbau-Zyklen anhand ihrer Events (Aussaat, Keimung, Auspflanzen, Ernte)'
+
+    def handle(self, *args, **options):
+        count = reconcile_statuses()
+        self.stdout.write(self.style.SUCCESS(f'{count} Zyklus-Status aktualisiert.'))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from plants.benchmark import seed_garden
+
+
+class Command(BaseCommand):
+    help = 'Legt synthetische Pflanzen, Zyklen, Events und Tasks für Benchmarks an'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--plants', type=int, default=100, help='Anzahl Pflanzen')
+        parser.add_argument('--years', type=int, default=3, help='Anbaujahre pro Pflanze (bis heute)')
+        parser.add_argument('--events-per-cycle', type=int, default=20, help='Events pro Zyklus')
+        parser.add_argument('--tasks-per-cycle', type=int, default=3, help='Tasks pro Zyklus')
+        parser.add_argument('--seed', type=int, default=0, help='Startwert des Zufallsgenerators')
+
+    def handle(self, *args, **options):
+        counts = seed_garden(
+            options['plants'],
+            options['years'],
+            options['events_per_cycle'],
+            tasks_per_cycle=options['tasks_per_cycle'],
+            seed=options['seed'],
+            progress=self.report_progress
+        )
+        created = ', '.join(f'{count} {name}' for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'Angelegt: {created}.'))
+
+    def report_progress(self, counts):
+        self.stdout.write(f"{counts['plants']} Pflanzen, {counts['events']} Events ...")
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.14 on 2026-10-18 16:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plants', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['event_date', 'created_at'], name='event_date_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['planting_cycle', 'event_date', 'created_at'], name='event_cycle_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['event_type', 'event_date', 'created_at'], name='event_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plant',
+            index=models.Index(fields=['name', 'variety'], name='plant_name_variety_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plantingcycle',
+            index=models.Index(fields=['year', 'status'], name='cycle_year_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['completed', 'due_date'], name='task_completed_due_idx'),
+        ),
+    ]
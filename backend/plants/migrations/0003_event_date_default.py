@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-18 16:47
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plants', '0002_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='event_date',
+            field=models.DateField(default=django.utils.timezone.localdate, verbose_name='Datum'),
+        ),
+    ]
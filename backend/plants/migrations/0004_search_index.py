@@ -0,0 +1,61 @@
+from django.db import migrations, transaction
+from django.db.utils import OperationalError
+
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE plants_plant_fts USING fts5("
+    "name, variety, seed_source, notes, event_notes, tokenize='unicode61')"
+)
+
+SQLITE_POPULATE = (
+    "INSERT INTO plants_plant_fts (rowid, name, variety, seed_source, notes, event_notes) "
+    "SELECT p.id, p.name, p.variety, p.seed_source, p.notes, "
+    "(SELECT group_concat(e.notes, ' ') FROM plants_event e "
+    "INNER JOIN plants_plantingcycle c ON c.id = e.planting_cycle_id "
+    "WHERE c.plant_id = p.id AND e.notes != '') FROM plants_plant p"
+)
+
+MYSQL_CREATE = [
+    'ALTER TABLE plants_plant ADD FULLTEXT INDEX plant_fulltext_idx (name, variety, seed_source, notes)',
+    'ALTER TABLE plants_event ADD FULLTEXT INDEX event_notes_fulltext_idx (notes)',
+]
+
+MYSQL_DROP = [
+    'ALTER TABLE plants_plant DROP INDEX plant_fulltext_idx',
+    'ALTER TABLE plants_event DROP INDEX event_notes_fulltext_idx',
+]
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        try:
+            with transaction.atomic(using=connection.alias):
+                schema_editor.execute(SQLITE_CREATE)
+        except OperationalError:
+            # SQLite ohne FTS5: Suche fällt auf icontains zurück
+            return
+        schema_editor.execute(SQLITE_POPULATE)
+    elif connection.vendor == 'mysql':
+        for statement in MYSQL_CREATE:
+            schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS plants_plant_fts')
+    elif connection.vendor == 'mysql':
+        for statement in MYSQL_DROP:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plants', '0003_event_date_default'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.0.14 on 2026-10-18 16:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def build_rollups(apps, schema_editor):
+    Event = apps.get_model('plants', 'Event')
+    EventRollup = apps.get_model('plants', 'EventRollup')
+    rows = (
+        Event.objects
+        .order_by()
+        .values(
+            'event_type',
+            plant_id=F('planting_cycle__plant_id'),
+            year=ExtractYear('event_date'),
+            month=ExtractMonth('event_date'),
+        )
+        .annotate(event_count=Count('id'), total_quantity=Sum('quantity'))
+    )
+    EventRollup.objects.bulk_create(
+        [
+            EventRollup(
+                plant_id=row['plant_id'],
+                event_type=row['event_type'],
+                year=row['year'],
+                month=row['month'],
+                event_count=row['event_count'],
+                total_quantity=row['total_quantity'] or 0,
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plants', '0004_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('sowing', 'Aussaat'), ('germination', 'Keimung'), ('transplanting', 'Umpflanzen'), ('watering', 'Gießen'), ('fertilizing', 'Düngen'), ('planting_out', 'Ins Beet pflanzen'), ('harvest', 'Ernte'), ('pruning', 'Schneiden'), ('other', 'Sonstiges')], max_length=20, verbose_name='Ereignistyp')),
+                ('year', models.IntegerField(verbose_name='Jahr')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Monat')),
+                ('event_count', models.PositiveIntegerField(default=0, verbose_name='Anzahl')),
+                ('total_quantity', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Gesamtmenge')),
+                ('plant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_rollups', to='plants.plant', verbose_name='Pflanze')),
+            ],
+            options={
+                'verbose_name': 'Ereignis-Summe',
+                'verbose_name_plural': 'Ereignis-Summen',
+                'ordering': ['year', 'month'],
+                'indexes': [models.Index(fields=['event_type', 'year', 'month'], name='rollup_type_period_idx')],
+                'unique_together': {('plant', 'event_type', 'year', 'month')},
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
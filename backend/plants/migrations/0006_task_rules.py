@@ -0,0 +1,33 @@
+# Generated by Django 5.0.14 on 2026-10-18 16:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plants', '0005_event_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='rule',
+            field=models.CharField(blank=True, help_text='Regel, die die Aufgabe erzeugt hat (siehe task_rules.py)', max_length=50, verbose_name='Regel'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='rule_step',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Laufende Nummer bei wiederkehrenden Aufgaben', verbose_name='Wiederholung'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='source_event',
+            field=models.ForeignKey(blank=True, help_text='Bei automatisch erzeugten Aufgaben', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='generated_tasks', to='plants.event', verbose_name='Auslösendes Ereignis'),
+        ),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(fields=('source_event', 'rule', 'rule_step'), name='task_source_rule_unique'),
+        ),
+    ]
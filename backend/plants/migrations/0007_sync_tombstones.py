@@ -0,0 +1,56 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:09
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    """Bestehende Datensätze gelten als zuletzt beim Anlegen geändert"""
+    for name in ('Plant', 'PlantingCycle', 'Event', 'Task'):
+        apps.get_model('plants', name).objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plants', '0006_task_rules'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Geändert am'),
+        ),
+        migrations.AddField(
+            model_name='plant',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Geändert am'),
+        ),
+        migrations.AddField(
+            model_name='plantingcycle',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Geändert am'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Geändert am'),
+        ),
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(help_text='plants, cycles, events oder tasks', max_length=20, verbose_name='Tabelle')),
+                ('object_id', models.BigIntegerField(verbose_name='ID')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, verbose_name='Gelöscht am')),
+            ],
+            options={
+                'verbose_name': 'Löschvermerk',
+                'verbose_name_plural': 'Löschvermerke',
+                'ordering': ['deleted_at'],
+                'indexes': [models.Index(fields=['deleted_at'], name='tombstone_deleted_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
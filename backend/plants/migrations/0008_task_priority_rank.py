@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:14
+
+from django.db import migrations, models
+
+PRIORITY_RANKS = {'high': 0, 'medium': 1, 'low': 2}
+
+
+def backfill_priority_rank(apps, schema_editor):
+    Task = apps.get_model('plants', 'Task')
+    for priority, rank in PRIORITY_RANKS.items():
+        Task.objects.filter(priority=priority).update(priority_rank=rank)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plants', '0007_sync_tombstones'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['completed', 'priority_rank', 'due_date'], 'verbose_name': 'Aufgabe', 'verbose_name_plural': 'Aufgaben'},
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='priority_rank',
+            field=models.PositiveSmallIntegerField(default=1, editable=False, help_text='Aus priority abgeleitet (0 = hoch), für Sortierung und Index', verbose_name='Prioritätsrang'),
+        ),
+        migrations.RunPython(backfill_priority_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['completed', 'priority_rank', 'due_date'], name='task_priority_due_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plants', '0008_task_priority_rank'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelVersion',
+            fields=[
+                ('model', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Modell')),
+                ('version', models.BigIntegerField(verbose_name='Version')),
+                ('changed_at', models.DateTimeField(verbose_name='Geändert am')),
+            ],
+            options={
+                'verbose_name': 'Änderungsstand',
+                'verbose_name_plural': 'Änderungsstände',
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plants', '0009_model_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DismissedTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rule', models.CharField(max_length=50, verbose_name='Regel')),
+                ('rule_step', models.PositiveSmallIntegerField(default=0, verbose_name='Wiederholung')),
+                ('dismissed_at', models.DateTimeField(auto_now_add=True, verbose_name='Gelöscht am')),
+                ('source_event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dismissed_tasks', to='plants.event', verbose_name='Auslösendes Ereignis')),
+            ],
+            options={
+                'verbose_name': 'Verworfene Aufgabe',
+                'verbose_name_plural': 'Verworfene Aufgaben',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dismissedtask',
+            constraint=models.UniqueConstraint(fields=('source_event', 'rule', 'rule_step'), name='dismissed_task_unique'),
+        ),
+    ]
@@ -1,6 +1,48 @@
 from django.db import models
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Now
 from django.utils import timezone
 
+from .cache import bump_data_version
+
+
+def _count_subquery(model, field):
+    """Anzahl der Zeilen von model, die über field auf die äußere Zeile zeigen"""
+    counts = (
+        model.objects.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+class PlantQuerySet(models.QuerySet):
+    """QuerySet mit Annotationen für Zyklus-Kennzahlen"""
+
+    def with_cycle_summary(self):
+        """Annotiert cycle_count, latest_cycle_year und latest_cycle_status per Subquery"""
+        latest = PlantingCycle.objects.filter(plant=OuterRef('pk')).order_by('-year')
+        return self.annotate(
+            cycle_count=_count_subquery(PlantingCycle, 'plant'),
+            latest_cycle_year=Subquery(latest.values('year')[:1]),
+            latest_cycle_status=Subquery(latest.values('status')[:1]),
+        )
+
+
+class PlantingCycleQuerySet(models.QuerySet):
+    """QuerySet mit Anzahl der Events und Tasks als Annotation"""
+
+    def with_counts(self, events=True, tasks=True):
+        """Annotiert event_total und/oder task_total per Subquery (ohne Join)"""
+        annotations = {}
+        if events:
+            annotations['event_total'] = _count_subquery(Event, 'planting_cycle')
+        if tasks:
+            annotations['task_total'] = _count_subquery(Task, 'planting_cycle')
+        return self.annotate(**annotations)
+
 
 class Plant(models.Model):
     """Pflanze mit Stammdaten"""
@@ -18,11 +60,17 @@ class Plant(models.Model):
     )
     notes = models.TextField(blank=True, verbose_name='Notizen')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Erstellt am')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, verbose_name='Geändert am')
+
+    objects = PlantQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Pflanze'
         verbose_name_plural = 'Pflanzen'
         ordering = ['name', 'variety']
+        indexes = [
+            models.Index(fields=['name', 'variety'], name='plant_name_variety_idx'),
+        ]
 
     def __str__(self):
         if self.variety:
@@ -69,12 +117,18 @@ class PlantingCycle(models.Model):
         verbose_name='Notizen zur Saatgutgewinnung'
     )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Erstellt am')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, verbose_name='Geändert am')
+
+    objects = PlantingCycleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Anbau-Zyklus'
         verbose_name_plural = 'Anbau-Zyklen'
         ordering = ['-year', 'plant__name']
         unique_together = ['plant', 'year']
+        indexes = [
+            models.Index(fields=['year', 'status'], name='cycle_year_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.plant.name} - {self.year}"
@@ -107,7 +161,7 @@ class Event(models.Model):
         verbose_name='Ereignistyp'
     )
     event_date = models.DateField(
-        default=timezone.now,
+        default=timezone.localdate,
         verbose_name='Datum'
     )
     location = models.CharField(
@@ -126,16 +180,93 @@ class Event(models.Model):
     )
     notes = models.TextField(blank=True, verbose_name='Notizen')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Erstellt am')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, verbose_name='Geändert am')
 
     class Meta:
         verbose_name = 'Ereignis'
         verbose_name_plural = 'Ereignisse'
         ordering = ['-event_date', '-created_at']
+        indexes = [
+            models.Index(fields=['event_date', 'created_at'], name='event_date_created_idx'),
+            models.Index(fields=['planting_cycle', 'event_date', 'created_at'], name='event_cycle_date_idx'),
+            models.Index(fields=['event_type', 'event_date', 'created_at'], name='event_type_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_event_type_display()} - {self.planting_cycle.plant.name} ({self.event_date})"
 
 
+class EventRollup(models.Model):
+    """Vorberechnete Monatssummen der Events pro Pflanze für Auswertungen"""
+    plant = models.ForeignKey(
+        Plant,
+        on_delete=models.CASCADE,
+        related_name='event_rollups',
+        verbose_name='Pflanze'
+    )
+    event_type = models.CharField(
+        max_length=20,
+        choices=Event.EVENT_TYPE_CHOICES,
+        verbose_name='Ereignistyp'
+    )
+    year = models.IntegerField(verbose_name='Jahr')
+    month = models.PositiveSmallIntegerField(verbose_name='Monat')
+    event_count = models.PositiveIntegerField(default=0, verbose_name='Anzahl')
+    total_quantity = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name='Gesamtmenge'
+    )
+
+    class Meta:
+        verbose_name = 'Ereignis-Summe'
+        verbose_name_plural = 'Ereignis-Summen'
+        ordering = ['year', 'month']
+        unique_together = ['plant', 'event_type', 'year', 'month']
+        indexes = [
+            models.Index(fields=['event_type', 'year', 'month'], name='rollup_type_period_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.plant} {self.event_type} {self.year}-{self.month:02d}"
+
+
+class TaskQuerySet(models.QuerySet):
+    """
+    Mengenbasierte Task-Änderungen mit je einem UPDATE.
+
+    update() löst keine Signale aus, deshalb werden Datenversion und
+    updated_at hier direkt gesetzt.
+    """
+
+    def _bulk_update(self, **values):
+        # auto_now greift bei update() nicht
+        updated = self.update(updated_at=timezone.now(), **values)
+        if updated:
+            bump_data_version(self.model)
+        return updated
+
+    def complete(self):
+        """Als erledigt markieren; completed_at wie in Task.save setzen"""
+        return self._bulk_update(
+            completed=True,
+            completed_at=Coalesce(F('completed_at'), Now())
+        )
+
+    def uncomplete(self):
+        """Als nicht erledigt markieren"""
+        return self._bulk_update(completed=False, completed_at=None)
+
+    def reschedule(self, due_date):
+        """Fälligkeitsdatum setzen (None entfernt es)"""
+        return self._bulk_update(due_date=due_date)
+
+    def reprioritize(self, priority):
+        """Priorität setzen, priority_rank wie in Task.save"""
+        return self._bulk_update(priority=priority, priority_rank=self.model.PRIORITY_RANKS[priority])
+
+
 class Task(models.Model):
     """Aufgabe - manuell oder automatisch generiert"""
 
@@ -145,6 +276,9 @@ class Task(models.Model):
         ('high', 'Hoch'),
     ]
 
+    # Sortierschlüssel zu priority, aufsteigend = wichtigste zuerst
+    PRIORITY_RANKS = {'high': 0, 'medium': 1, 'low': 2}
+
     planting_cycle = models.ForeignKey(
         PlantingCycle,
         on_delete=models.CASCADE,
@@ -173,12 +307,52 @@ class Task(models.Model):
         default='medium',
         verbose_name='Priorität'
     )
+    priority_rank = models.PositiveSmallIntegerField(
+        default=1,
+        editable=False,
+        verbose_name='Prioritätsrang',
+        help_text='Aus priority abgeleitet (0 = hoch), für Sortierung und Index'
+    )
+    source_event = models.ForeignKey(
+        Event,
+        on_delete=models.SET_NULL,
+        related_name='generated_tasks',
+        null=True,
+        blank=True,
+        verbose_name='Auslösendes Ereignis',
+        help_text='Bei automatisch erzeugten Aufgaben'
+    )
+    rule = models.CharField(
+        max_length=50,
+        blank=True,
+        verbose_name='Regel',
+        help_text='Regel, die die Aufgabe erzeugt hat (siehe task_rules.py)'
+    )
+    rule_step = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Wiederholung',
+        help_text='Laufende Nummer bei wiederkehrenden Aufgaben'
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Erstellt am')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, verbose_name='Geändert am')
+
+    objects = TaskQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Aufgabe'
         verbose_name_plural = 'Aufgaben'
-        ordering = ['completed', '-priority', 'due_date']
+        ordering = ['completed', 'priority_rank', 'due_date']
+        indexes = [
+            models.Index(fields=['completed', 'due_date'], name='task_completed_due_idx'),
+            models.Index(fields=['completed', 'priority_rank', 'due_date'], name='task_priority_due_idx'),
+        ]
+        constraints = [
+            # Pro Event, Regel und Wiederholung höchstens eine Aufgabe
+            models.UniqueConstraint(
+                fields=['source_event', 'rule', 'rule_step'],
+                name='task_source_rule_unique'
+            ),
+        ]
 
     def __str__(self):
         status = "✓" if self.completed else "○"
@@ -190,4 +364,67 @@ class Task(models.Model):
             self.completed_at = timezone.now()
         elif not self.completed:
             self.completed_at = None
+        self.priority_rank = self.PRIORITY_RANKS.get(self.priority, 1)
         super().save(*args, **kwargs)
+
+
+class DismissedTask(models.Model):
+    """Gelöschte automatisch erzeugte Aufgabe, die Regel legt sie nicht erneut an"""
+    source_event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='dismissed_tasks',
+        verbose_name='Auslösendes Ereignis'
+    )
+    rule = models.CharField(max_length=50, verbose_name='Regel')
+    rule_step = models.PositiveSmallIntegerField(default=0, verbose_name='Wiederholung')
+    dismissed_at = models.DateTimeField(auto_now_add=True, verbose_name='Gelöscht am')
+
+    class Meta:
+        verbose_name = 'Verworfene Aufgabe'
+        verbose_name_plural = 'Verworfene Aufgaben'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['source_event', 'rule', 'rule_step'],
+                name='dismissed_task_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.rule} #{self.rule_step} ({self.source_event_id})"
+
+
+class Tombstone(models.Model):
+    """Gelöschter Datensatz, damit /api/sync/ Löschungen melden kann"""
+    model = models.CharField(
+        max_length=20,
+        verbose_name='Tabelle',
+        help_text='plants, cycles, events oder tasks'
+    )
+    object_id = models.BigIntegerField(verbose_name='ID')
+    deleted_at = models.DateTimeField(auto_now_add=True, verbose_name='Gelöscht am')
+
+    class Meta:
+        verbose_name = 'Löschvermerk'
+        verbose_name_plural = 'Löschvermerke'
+        ordering = ['deleted_at']
+        indexes = [
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id}"
+
+
+class ModelVersion(models.Model):
+    """Änderungsstand eines Modells für Cache-Keys, ETag und Last-Modified (siehe cache.py)"""
+    model = models.CharField(max_length=100, primary_key=True, verbose_name='Modell')
+    version = models.BigIntegerField(verbose_name='Version')
+    changed_at = models.DateTimeField(verbose_name='Geändert am')
+
+    class Meta:
+        verbose_name = 'Änderungsstand'
+        verbose_name_plural = 'Änderungsstände'
+
+    def __str__(self):
+        return f"{self.model} v{self.version}"
@@ -0,0 +1,171 @@
+"""
+Keyset-Pagination für die Event- und Task-Feeds.
+
+Anders als PageNumberPagination braucht sie weder OFFSET noch COUNT(*):
+der Cursor enthält die Sortierwerte des letzten Eintrags, die nächste
+Seite beginnt per WHERE direkt dahinter. Aktiv mit ?pagination=cursor.
+"""
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from .export import ExportJSONEncoder
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor-Pagination über alle Felder von Meta.ordering plus id.
+
+    NULL gilt als kleinster Wert (wie bei SQLite und MySQL), die
+    Sortierung wird dafür explizit gesetzt.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Ungültiger Cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.model = queryset.model
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        queryset = queryset.order_by(*[self.order_expression(f) for f in self.ordering])
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_ordering(self, queryset):
+        """Sortierung aus Meta.ordering, eindeutig gemacht durch id"""
+        ordering = list(self.model._meta.ordering)
+        if not any(f.lstrip('-') in ('id', 'pk') for f in ordering):
+            ordering.append('id')
+        return ordering
+
+    def is_nullable(self, name):
+        return name not in ('id', 'pk') and self.get_field(name).null
+
+    def order_expression(self, field):
+        name = field.lstrip('-')
+        if not self.is_nullable(name):
+            return field
+        if field.startswith('-'):
+            return F(name).desc(nulls_last=True)
+        return F(name).asc(nulls_first=True)
+
+    def after(self, position):
+        """WHERE-Bedingung für alle Zeilen hinter der Cursor-Position"""
+        condition = Q(pk__in=[])
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            condition |= equal & self.beyond(name, value, field.startswith('-'))
+            if value is None:
+                equal &= Q(**{f'{name}__isnull': True})
+            else:
+                equal &= Q(**{name: value})
+        return condition
+
+    def beyond(self, name, value, descending):
+        """Werte, die in Sortierrichtung hinter value liegen"""
+        if descending:
+            if value is None:
+                return Q(pk__in=[])
+            condition = Q(**{f'{name}__lt': value})
+            if self.is_nullable(name):
+                condition |= Q(**{f'{name}__isnull': True})
+            return condition
+        if value is None:
+            return Q(**{f'{name}__isnull': False})
+        return Q(**{f'{name}__gt': value})
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return [
+                None if value is None else self.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_field(self, name):
+        if name == 'pk':
+            return self.model._meta.pk
+        return self.model._meta.get_field(name)
+
+    def encode_cursor(self, obj):
+        position = [getattr(obj, f.lstrip('-')) for f in self.ordering]
+        # Zeitstempel mit Mikrosekunden, sonst überspringt der Vergleich
+        # Zeilen aus derselben Millisekunde
+        raw = json.dumps(position, cls=ExportJSONEncoder)
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+
+class SelectablePaginationMixin:
+    """Erlaubt ?pagination=cursor als Alternative zur Seiten-Pagination"""
+    cursor_pagination_class = KeysetPagination
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.request.query_params.get('pagination') == 'cursor':
+                self._paginator = self.cursor_pagination_class()
+            else:
+                return super().paginator
+        return self._paginator
@@ -0,0 +1,71 @@
+"""
+Serverseitiger Cache für list/retrieve-Antworten.
+
+Der Cache-Key ist der ETag aus ConditionalGetMixin: er enthält URL samt
+Query-String, Renderer und die Änderungsstände der beteiligten Modelle.
+Sobald ein Signal den Stand eines dieser Modelle erneuert, wird der
+Eintrag nicht mehr getroffen und läuft aus.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from .conditional import ConditionalGetMixin
+
+RESPONSE_KEY = 'plants:response:{}'
+COUNTER_KEY = 'plants:response_stats:{}:{}:{}'
+
+
+def _increment(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+class ResponseCacheMixin(ConditionalGetMixin):
+    """Cacht die serialisierten Daten der Actions in cached_actions"""
+    cached_actions = ('list', 'retrieve')
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not settings.PLANTS_RESPONSE_CACHE or self.action not in self.cached_actions:
+            return handler(request, *args, **kwargs)
+
+        etag, _ = self.conditional_state
+        key = RESPONSE_KEY.format(etag.strip('"'))
+        data = cache.get(key)
+        if data is not None:
+            _increment(COUNTER_KEY.format(self.basename, self.action, 'hits'))
+            return Response(data)
+
+        _increment(COUNTER_KEY.format(self.basename, self.action, 'misses'))
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, timeout=settings.PLANTS_CACHE_TIMEOUT)
+        return response
+
+
+def response_cache_stats():
+    """Hit/Miss-Zähler pro Route und Action"""
+    from .urls import router
+
+    keys = {}
+    for _, viewset, basename in router.registry:
+        if issubclass(viewset, ResponseCacheMixin):
+            for action in viewset.cached_actions:
+                for counter in ('hits', 'misses'):
+                    keys[COUNTER_KEY.format(basename, action, counter)] = (basename, action, counter)
+
+    values = cache.get_many(keys)
+    stats = {}
+    for key, (basename, action, counter) in keys.items():
+        stats.setdefault(basename, {}).setdefault(action, {})[counter] = values.get(key, 0)
+    return stats
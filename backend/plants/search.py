@@ -0,0 +1,157 @@
+"""
+Volltextsuche für Pflanzen.
+
+Durchsucht Name, Sorte, Samenherkunft und Notizen einer Pflanze sowie die
+Notizen aller ihrer Events. Je nach Datenbank:
+
+- SQLite: FTS5-Tabelle plants_plant_fts (eine Zeile pro Pflanze, rowid =
+  Plant.id), die per Signal bei Änderungen an Plant und Event aktualisiert
+  wird (siehe signals.py)
+- MySQL/MariaDB: FULLTEXT-Indizes auf plants_plant und plants_event
+- sonst bzw. ohne Index: icontains wie bisher
+
+Alle Suchwörter müssen vorkommen, das letzte Wort wird als Präfix gesucht
+(Suche während der Eingabe). Treffer werden nach Relevanz sortiert.
+"""
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'plants_plant_fts'
+
+# Gewichtung für bm25: name, variety, seed_source, notes, event_notes
+FTS_WEIGHTS = (10.0, 5.0, 1.0, 1.0, 0.5)
+
+# InnoDB ignoriert standardmäßig kürzere Wörter (innodb_ft_min_token_size)
+MYSQL_MIN_TOKEN_LENGTH = 3
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+_fts_available = None
+
+
+def search_terms(search):
+    """Suchwörter aus der Eingabe (Sonderzeichen werden ignoriert)"""
+    return TOKEN_RE.findall(search)
+
+
+def fts_available():
+    """Gibt es einen Volltextindex für die aktuelle Datenbank?"""
+    global _fts_available
+    if _fts_available is None:
+        if connection.vendor == 'sqlite':
+            _fts_available = FTS_TABLE in connection.introspection.table_names()
+        else:
+            _fts_available = connection.vendor == 'mysql'
+    return _fts_available
+
+
+def search_plants(queryset, search):
+    """Filtert Pflanzen nach search und annotiert search_rank (höher = besser)"""
+    terms = search_terms(search)
+    if not terms:
+        return queryset.none()
+
+    if fts_available() and connection.vendor == 'sqlite':
+        return _search_sqlite(queryset, terms)
+    if (fts_available() and connection.vendor == 'mysql'
+            and all(len(term) >= MYSQL_MIN_TOKEN_LENGTH for term in terms)):
+        return _search_mysql(queryset, terms)
+    return _search_like(queryset, terms)
+
+
+def _search_sqlite(queryset, terms):
+    # Jedes Wort als FTS5-String, das letzte zusätzlich als Präfix
+    match = ' '.join(f'"{term}"' for term in terms) + '*'
+    weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+    rank = RawSQL(
+        f'SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s AND rowid = plants_plant.id',
+        [match],
+        output_field=FloatField()
+    )
+    matches = RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+    return queryset.filter(id__in=matches).annotate(search_rank=rank).order_by('-search_rank', 'name')
+
+
+def _search_mysql(queryset, terms):
+    match = ' '.join(f'+{term}' for term in terms) + '*'
+    plant_match = (
+        'MATCH(plants_plant.name, plants_plant.variety, plants_plant.seed_source, '
+        'plants_plant.notes) AGAINST (%s IN BOOLEAN MODE)'
+    )
+    event_matches = RawSQL(
+        'SELECT c.plant_id FROM plants_event e '
+        'INNER JOIN plants_plantingcycle c ON c.id = e.planting_cycle_id '
+        'WHERE MATCH(e.notes) AGAINST (%s IN BOOLEAN MODE)',
+        [match]
+    )
+    plant_matches = RawSQL(f'SELECT plants_plant.id FROM plants_plant WHERE {plant_match}', [match])
+    return queryset.filter(
+        Q(id__in=plant_matches) | Q(id__in=event_matches)
+    ).annotate(
+        search_rank=RawSQL(plant_match, [match], output_field=FloatField())
+    ).order_by('-search_rank', 'name')
+
+
+def _search_like(queryset, terms):
+    for term in terms:
+        queryset = queryset.filter(
+            Q(name__icontains=term) |
+            Q(variety__icontains=term) |
+            Q(seed_source__icontains=term) |
+            Q(notes__icontains=term) |
+            Q(cycles__events__notes__icontains=term)
+        )
+    return queryset.distinct()
+
+
+# --- Index-Pflege (nur SQLite/FTS5) -----------------------------------------
+# Läuft in derselben Transaktion wie die Änderung, ein Rollback nimmt
+# also auch die Index-Änderung zurück.
+
+def _index_maintained():
+    return connection.vendor == 'sqlite' and fts_available()
+
+
+def reindex_plants(plant_ids=None):
+    """Index-Zeilen der Pflanzen neu aufbauen (None = alle)"""
+    if plant_ids is None:
+        _reindex(None, [])
+        return
+    plant_ids = [plant_id for plant_id in set(plant_ids) if plant_id is not None]
+    if plant_ids:
+        _reindex(', '.join(['%s'] * len(plant_ids)), plant_ids)
+
+
+def reindex_cycles(cycle_ids):
+    """Index-Zeilen der Pflanzen zu den angegebenen Zyklen neu aufbauen"""
+    cycle_ids = [cycle_id for cycle_id in set(cycle_ids) if cycle_id is not None]
+    if cycle_ids:
+        placeholders = ', '.join(['%s'] * len(cycle_ids))
+        _reindex(
+            f'SELECT plant_id FROM plants_plantingcycle WHERE id IN ({placeholders})',
+            cycle_ids
+        )
+
+
+def _reindex(plant_ids_sql, params):
+    if not _index_maintained():
+        return
+    with connection.cursor() as cursor:
+        if plant_ids_sql is None:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            where = ''
+        else:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({plant_ids_sql})', params)
+            where = f'WHERE p.id IN ({plant_ids_sql})'
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, variety, seed_source, notes, event_notes) '
+            'SELECT p.id, p.name, p.variety, p.seed_source, p.notes, '
+            '(SELECT group_concat(e.notes, \' \') FROM plants_event e '
+            'INNER JOIN plants_plantingcycle c ON c.id = e.planting_cycle_id '
+            f'WHERE c.plant_id = p.id AND e.notes != \'\') FROM plants_plant p {where}',
+            params
+        )
@@ -1,9 +1,46 @@
+from django.db import transaction
 from rest_framework import serializers
+from .bulk_writes import after_bulk_write
+from .instrumentation import TimedSerializerMixin
 from .models import Plant, PlantingCycle, Event, Task
+from .sparse_fields import SparseFieldsMixin
 
 
-class EventSerializer(serializers.ModelSerializer):
+class PrefetchedCycleField(serializers.PrimaryKeyRelatedField):
+    """
+    PK-Feld für Zyklen, das vorab geladene Zyklen aus
+    context['planting_cycles'] nutzt statt einer Query pro Eintrag
+    """
+
+    def to_internal_value(self, data):
+        cycles = self.context.get('planting_cycles')
+        if cycles is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return cycles[int(data)]
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+
+
+class EventListSerializer(serializers.ListSerializer):
+    """Legt mehrere Events mit einem bulk_create an"""
+
+    @transaction.atomic
+    def create(self, validated_data):
+        events = Event.objects.bulk_create(
+            [Event(**attrs) for attrs in validated_data]
+        )
+        after_bulk_write([Event], events=events)
+        return events
+
+
+class EventSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer für Events"""
+    planting_cycle = PrefetchedCycleField(queryset=PlantingCycle.objects.all())
     event_type_display = serializers.CharField(
         source='get_event_type_display',
         read_only=True
@@ -11,6 +48,7 @@ class EventSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Event
+        list_serializer_class = EventListSerializer
         fields = [
             'id',
             'planting_cycle',
@@ -20,12 +58,13 @@ class EventSerializer(serializers.ModelSerializer):
             'location',
             'quantity',
             'notes',
-            'created_at'
+            'created_at',
+            'updated_at'
         ]
-        read_only_fields = ['created_at']
+        read_only_fields = ['created_at', 'updated_at']
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer für Tasks"""
     priority_display = serializers.CharField(
         source='get_priority_display',
@@ -44,12 +83,60 @@ class TaskSerializer(serializers.ModelSerializer):
             'completed_at',
             'priority',
             'priority_display',
-            'created_at'
+            'source_event',
+            'rule',
+            'created_at',
+            'updated_at'
         ]
-        read_only_fields = ['created_at', 'completed_at']
+        read_only_fields = ['created_at', 'updated_at', 'completed_at', 'source_event', 'rule']
+
+
+class TaskFilterSerializer(serializers.Serializer):
+    """Filter für Bulk-Änderungen, dieselben Schlüssel wie TaskViewSet.filter_tasks"""
+    completed = serializers.BooleanField(required=False)
+    cycle = serializers.IntegerField(required=False)
+    priority = serializers.ChoiceField(choices=Task.PRIORITY_CHOICES, required=False)
+    overdue = serializers.BooleanField(required=False)
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict):
+            unknown = sorted(set(data) - set(self.fields))
+            if unknown:
+                raise serializers.ValidationError(f'Unbekannte Filter: {", ".join(unknown)}')
+        attrs = super().to_internal_value(data)
+        # Ein leerer Filter würde alle Aufgaben ändern; overdue=false schränkt nichts ein
+        if not {key: value for key, value in attrs.items() if key != 'overdue' or value}:
+            raise serializers.ValidationError(
+                f'Mindestens einen Filter angeben ({", ".join(self.fields)}).'
+            )
+        return attrs
+
+
+class TaskBulkSerializer(serializers.Serializer):
+    """Eingabe für mengenbasierte Task-Änderungen"""
+    ACTION_CHOICES = ['complete', 'uncomplete', 'reschedule', 'reprioritize']
+
+    action = serializers.ChoiceField(choices=ACTION_CHOICES)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False
+    )
+    filter = TaskFilterSerializer(required=False)
+    due_date = serializers.DateField(required=False, allow_null=True)
+    priority = serializers.ChoiceField(choices=Task.PRIORITY_CHOICES, required=False)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError('Entweder ids oder filter angeben.')
+        if attrs['action'] == 'reschedule' and 'due_date' not in attrs:
+            raise serializers.ValidationError({'due_date': 'Pflichtfeld für reschedule.'})
+        if attrs['action'] == 'reprioritize' and 'priority' not in attrs:
+            raise serializers.ValidationError({'priority': 'Pflichtfeld für reprioritize.'})
+        return attrs
 
 
-class PlantingCycleSerializer(serializers.ModelSerializer):
+class PlantingCycleSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer für PlantingCycles"""
     plant_name = serializers.CharField(source='plant.name', read_only=True)
     plant_variety = serializers.CharField(source='plant.variety', read_only=True)
@@ -59,14 +146,8 @@ class PlantingCycleSerializer(serializers.ModelSerializer):
     )
     events = EventSerializer(many=True, read_only=True)
     tasks = TaskSerializer(many=True, read_only=True)
-    event_count = serializers.IntegerField(
-        source='events.count',
-        read_only=True
-    )
-    task_count = serializers.IntegerField(
-        source='tasks.count',
-        read_only=True
-    )
+    event_count = serializers.SerializerMethodField()
+    task_count = serializers.SerializerMethodField()
 
     class Meta:
         model = PlantingCycle
@@ -84,18 +165,29 @@ class PlantingCycleSerializer(serializers.ModelSerializer):
             'tasks',
             'event_count',
             'task_count',
-            'created_at'
+            'created_at',
+            'updated_at'
         ]
-        read_only_fields = ['created_at']
+        read_only_fields = ['created_at', 'updated_at']
+        expandable_fields = {'events': EventSerializer, 'tasks': TaskSerializer}
 
+    def get_event_count(self, obj):
+        # Annotation aus with_counts(), wenn die Events nicht geladen werden,
+        # sonst len() auf die per prefetch_related geladenen Events
+        if hasattr(obj, 'event_total'):
+            return obj.event_total
+        return len(obj.events.all())
 
-class PlantSerializer(serializers.ModelSerializer):
+    def get_task_count(self, obj):
+        if hasattr(obj, 'task_total'):
+            return obj.task_total
+        return len(obj.tasks.all())
+
+
+class PlantSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer für Plants"""
     cycles = PlantingCycleSerializer(many=True, read_only=True)
-    cycle_count = serializers.IntegerField(
-        source='cycles.count',
-        read_only=True
-    )
+    cycle_count = serializers.SerializerMethodField()
     latest_cycle = serializers.SerializerMethodField()
 
     class Meta:
@@ -109,27 +201,42 @@ class PlantSerializer(serializers.ModelSerializer):
             'cycles',
             'cycle_count',
             'latest_cycle',
-            'created_at'
+            'created_at',
+            'updated_at'
         ]
-        read_only_fields = ['created_at']
+        read_only_fields = ['created_at', 'updated_at']
+        expandable_fields = {'cycles': PlantingCycleSerializer, 'latest_cycle': PlantingCycleSerializer}
+
+    def get_cycle_count(self, obj):
+        # Annotation aus with_cycle_summary(), wenn die Zyklen nicht geladen werden
+        if hasattr(obj, 'cycle_count'):
+            return obj.cycle_count
+        return len(obj.cycles.all())
 
     def get_latest_cycle(self, obj):
-        """Gibt den neuesten Zyklus zurück"""
-        latest = obj.cycles.order_by('-year').first()
+        """Gibt den neuesten Zyklus zurück (aus den vorgeladenen Zyklen)"""
+        latest = max(obj.cycles.all(), key=lambda cycle: cycle.year, default=None)
         if latest:
-            return PlantingCycleSerializer(latest).data
+            return PlantingCycleSerializer(
+                latest,
+                context=self.context,
+                field_selection=self.field_selection.nested('latest_cycle')
+            ).data
         return None
 
 
-class PlantListSerializer(serializers.ModelSerializer):
-    """Vereinfachter Serializer für Pflanzenliste"""
-    cycle_count = serializers.IntegerField(
-        source='cycles.count',
-        read_only=True
-    )
-    latest_cycle_year = serializers.SerializerMethodField()
+class PlantListSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    """Vereinfachter Serializer für Pflanzenliste
+
+    Liest nur Annotationen aus PlantQuerySet.with_cycle_summary(),
+    damit pro Seite keine zusätzlichen Queries anfallen.
+    """
+    cycle_count = serializers.IntegerField(read_only=True)
+    latest_cycle_year = serializers.IntegerField(read_only=True)
     latest_cycle_status = serializers.SerializerMethodField()
 
+    STATUS_LABELS = dict(PlantingCycle.STATUS_CHOICES)
+
     class Meta:
         model = Plant
         fields = [
@@ -139,14 +246,11 @@ class PlantListSerializer(serializers.ModelSerializer):
             'cycle_count',
             'latest_cycle_year',
             'latest_cycle_status',
-            'created_at'
+            'created_at',
+            'updated_at'
         ]
-        read_only_fields = ['created_at']
-
-    def get_latest_cycle_year(self, obj):
-        latest = obj.cycles.order_by('-year').first()
-        return latest.year if latest else None
+        read_only_fields = ['created_at', 'updated_at']
 
     def get_latest_cycle_status(self, obj):
-        latest = obj.cycles.order_by('-year').first()
-        return latest.get_status_display() if latest else None
+        status = obj.latest_cycle_status
+        return self.STATUS_LABELS.get(status, status) if status else None
@@ -0,0 +1,195 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .analytics import event_bucket, rebuild_rollups, refresh_buckets
+from .cache import bump_data_version
+from .cycle_status import advance_for_events
+from .models import Plant, PlantingCycle, Event, Task
+from .search import reindex_cycles, reindex_plants
+from .sync import record_deletion, record_deletions
+from .task_rules import dismiss, generate_for_events
+
+# Modelle, deren Zeilen beim Löschen des Schlüssels per CASCADE mitgehen
+CASCADED_MODELS = {
+    Plant: [PlantingCycle, Event, Task],
+    PlantingCycle: [Event, Task],
+}
+
+
+def deleted_by_cascade(sender, origin=None):
+    """
+    Löschung über einen Fremdschlüssel ausgelöst (origin ist die gelöschte
+    Pflanze bzw. der Zyklus)? Der Handler des Ursprungs erledigt die Arbeit
+    dann einmal für alle Zeilen statt pro Zeile.
+    """
+    if origin is None:
+        return False
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is not sender
+
+
+@receiver(post_save, sender=Plant)
+@receiver(post_save, sender=PlantingCycle)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Plant)
+@receiver(post_delete, sender=PlantingCycle)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Task)
+def invalidate_cached_data(sender, signal, origin=None, **kwargs):
+    """Versionierten Cache bei jeder Datenänderung invalidieren"""
+    if deleted_by_cascade(sender, origin):
+        return
+    bump_data_version(sender)
+    if signal is post_delete:
+        # Per CASCADE mitgelöschte Zeilen einmal statt pro Zeile
+        for model in CASCADED_MODELS.get(sender, ()):
+            bump_data_version(model)
+
+
+@receiver(post_delete, sender=Plant)
+@receiver(post_delete, sender=PlantingCycle)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Task)
+def record_tombstone(sender, instance, origin=None, **kwargs):
+    """Löschung für /api/sync/ vermerken, kaskadierte siehe record_cascaded_tombstones"""
+    if not deleted_by_cascade(sender, origin):
+        record_deletion(sender, instance.pk)
+
+
+@receiver(pre_delete, sender=Plant)
+@receiver(pre_delete, sender=PlantingCycle)
+def record_cascaded_tombstones(sender, instance, origin=None, **kwargs):
+    """Zyklen, Events und Tasks, die per CASCADE mitgelöscht werden, gesammelt vermerken"""
+    if deleted_by_cascade(sender, origin):
+        return
+    if sender is Plant:
+        cycle_ids = PlantingCycle.objects.filter(plant=instance).values_list('pk', flat=True)
+        record_deletions(PlantingCycle, cycle_ids)
+        lookup = 'planting_cycle__plant'
+    else:
+        lookup = 'planting_cycle'
+    for model in (Event, Task):
+        record_deletions(model, model.objects.filter(**{lookup: instance}).values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Event)
+@receiver(pre_delete, sender=PlantingCycle)
+@receiver(pre_delete, sender=Plant)
+def touch_generated_tasks(sender, instance, origin=None, **kwargs):
+    """source_event wird per SET_NULL ohne updated_at geleert, Tasks als geändert markieren"""
+    if deleted_by_cascade(sender, origin):
+        return
+    if sender is Event:
+        tasks = Task.objects.filter(source_event=instance)
+    elif sender is PlantingCycle:
+        # Tasks desselben Zyklus werden ohnehin mitgelöscht
+        tasks = Task.objects.filter(source_event__planting_cycle=instance).exclude(planting_cycle=instance)
+    else:
+        tasks = (
+            Task.objects.filter(source_event__planting_cycle__plant=instance)
+            .exclude(planting_cycle__plant=instance)
+        )
+    if tasks.update(updated_at=timezone.now()):
+        bump_data_version(Task)
+
+
+@receiver(post_delete, sender=Task)
+def dismiss_generated_task(sender, instance, origin=None, **kwargs):
+    """Gelöschte erzeugte Aufgabe nicht erneut aus der Regel anlegen"""
+    if not deleted_by_cascade(sender, origin):
+        dismiss([instance])
+
+
+@receiver(post_save, sender=Plant)
+@receiver(post_delete, sender=Plant)
+def update_plant_search_index(sender, instance, **kwargs):
+    """Suchindex der Pflanze aktualisieren bzw. entfernen"""
+    reindex_plants([instance.pk])
+
+
+@receiver(post_save, sender=PlantingCycle)
+@receiver(post_delete, sender=PlantingCycle)
+def update_cycle_search_index(sender, instance, signal, origin=None, **kwargs):
+    """Event-Notizen eines gelöschten oder umgehängten Zyklus im Suchindex nachziehen"""
+    if signal is post_save:
+        reindex_plants(moved_cycle_plants(instance))
+    elif not deleted_by_cascade(sender, origin):
+        reindex_plants([instance.plant_id])
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def update_event_search_index(sender, instance, origin=None, **kwargs):
+    """Event-Notizen im Suchindex der Pflanze aktualisieren"""
+    if not deleted_by_cascade(sender, origin):
+        reindex_cycles([instance.planting_cycle_id])
+
+
+@receiver(pre_save, sender=Event)
+def remember_event_bucket(sender, instance, **kwargs):
+    """Bisherigen Monat merken, falls Datum, Typ oder Zyklus geändert werden"""
+    instance._previous_rollup_bucket = None
+    if instance.pk:
+        previous = Event.objects.filter(pk=instance.pk).first()
+        if previous is not None:
+            instance._previous_rollup_bucket = event_bucket(previous)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def update_event_rollups(sender, instance, origin=None, **kwargs):
+    """Betroffene Monatssummen in EventRollup neu berechnen"""
+    if deleted_by_cascade(sender, origin):
+        # Siehe update_cycle_rollups; Pflanzen löschen ihre Summen per CASCADE
+        return
+    buckets = [event_bucket(instance)]
+    if getattr(instance, '_previous_rollup_bucket', None):
+        buckets.append(instance._previous_rollup_bucket)
+    refresh_buckets(buckets)
+
+
+@receiver(pre_save, sender=PlantingCycle)
+def remember_cycle_plant(sender, instance, raw=False, **kwargs):
+    """Bisherige Pflanze merken, falls der Zyklus umgehängt wird"""
+    instance._previous_plant_id = None
+    if instance.pk and not raw:
+        instance._previous_plant_id = (
+            PlantingCycle.objects.filter(pk=instance.pk).values_list('plant_id', flat=True).first()
+        )
+
+
+def moved_cycle_plants(instance):
+    """Alte und neue Pflanze eines umgehängten Zyklus, sonst leer"""
+    previous = getattr(instance, '_previous_plant_id', None)
+    if previous is None or previous == instance.plant_id:
+        return []
+    return [previous, instance.plant_id]
+
+
+@receiver(post_save, sender=PlantingCycle)
+@receiver(post_delete, sender=PlantingCycle)
+def update_cycle_rollups(sender, instance, signal, origin=None, **kwargs):
+    """Summen der Pflanze(n) nach dem Löschen oder Umhängen eines Zyklus neu aufbauen"""
+    if signal is post_save:
+        plants = moved_cycle_plants(instance)
+        if plants:
+            rebuild_rollups(plants)
+    elif not deleted_by_cascade(sender, origin):
+        rebuild_rollups([instance.plant_id])
+
+
+@receiver(post_save, sender=Event)
+def generate_event_tasks(sender, instance, created, raw=False, **kwargs):
+    """Aufgaben nach den Regeln in task_rules.py erzeugen"""
+    if created and not raw:
+        generate_for_events([instance])
+
+
+@receiver(post_save, sender=Event)
+def advance_cycle_status(sender, instance, raw=False, **kwargs):
+    """Status des Zyklus nach dem Ereignistyp vorrücken (siehe cycle_status.py)"""
+    if not raw:
+        advance_for_events([instance])
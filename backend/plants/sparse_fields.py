@@ -0,0 +1,114 @@
+"""
+Feldauswahl für API-Antworten über ?fields= und ?expand=.
+
+- fields: kommagetrennte Feldnamen, nur diese werden ausgegeben. Mit Punkt
+  für verschachtelte Serializer, z.B. fields=id,name,cycles.year
+- expand: welche verschachtelten Listen/Objekte (Meta.expandable_fields)
+  eingebettet werden, z.B. expand=events oder expand=cycles.tasks.
+  expand= (leer) bettet nichts ein, ohne expand bleibt alles wie bisher.
+
+Die ViewSets werten dieselbe Auswahl für ihren Fetch-Plan aus: nicht
+ausgegebene Beziehungen werden weder per select_related noch per
+prefetch_related geladen. Die Auswahl gilt nur für lesende Requests,
+Antworten auf POST/PUT/PATCH enthalten immer alle Felder.
+"""
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _top(paths):
+    return {path.split('.', 1)[0] for path in paths}
+
+
+def _below(paths, name):
+    prefix = name + '.'
+    return {path[len(prefix):] for path in paths if path.startswith(prefix)}
+
+
+def _parse(value):
+    if value is None:
+        return None
+    return {part.strip() for part in value.split(',') if part.strip()}
+
+
+class FieldSelection:
+    """Gewählte Felder (None = alle) und eingebettete Felder (None = Standard)"""
+
+    def __init__(self, fields=None, expand=None):
+        self.fields = fields
+        self.expand = expand
+
+    @classmethod
+    def from_params(cls, params):
+        return cls(_parse(params.get('fields')), _parse(params.get('expand')))
+
+    def includes(self, name, expandable=False):
+        """Wird das Feld name auf dieser Ebene ausgegeben?"""
+        if self.fields is not None:
+            return name in _top(self.fields)
+        if expandable and self.expand is not None:
+            return name in _top(self.expand)
+        return True
+
+    def nested(self, name):
+        """Auswahl für den verschachtelten Serializer im Feld name"""
+        fields = None
+        if self.fields is not None:
+            # Nur "cycles" ohne "cycles.x" heißt: alle Felder der Zyklen
+            fields = _below(self.fields, name) or None
+        expand = None if self.expand is None else _below(self.expand, name)
+        return FieldSelection(fields, expand)
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mit Feldauswahl (field_selection=FieldSelection(...)).
+
+    Meta.expandable_fields ordnet verschachtelten Feldern ihre
+    Serializer-Klasse zu.
+    """
+
+    def __init__(self, *args, field_selection=None, **kwargs):
+        self.field_selection = field_selection or FieldSelection()
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def expandable_fields(cls):
+        return getattr(cls.Meta, 'expandable_fields', {})
+
+    @classmethod
+    def selects(cls, selection, *path):
+        """Wird das Feld path (z.B. 'cycles', 'events') bei dieser Auswahl ausgegeben?"""
+        name, rest = path[0], path[1:]
+        expandable = cls.expandable_fields()
+        if not selection.includes(name, name in expandable):
+            return False
+        if not rest:
+            return True
+        return expandable[name].selects(selection.nested(name), *rest)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        expandable = self.expandable_fields()
+        for name in list(fields):
+            if not self.field_selection.includes(name, name in expandable):
+                del fields[name]
+            elif name in expandable:
+                nested = getattr(fields[name], 'child', fields[name])
+                if isinstance(nested, SparseFieldsMixin):
+                    nested.field_selection = self.field_selection.nested(name)
+        return fields
+
+
+class FieldSelectionMixin:
+    """ViewSet-Mixin: reicht ?fields=/?expand= an den Serializer weiter"""
+
+    @property
+    def field_selection(self):
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS:
+            return FieldSelection()
+        return FieldSelection.from_params(request.query_params)
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('field_selection', self.field_selection)
+        return super().get_serializer(*args, **kwargs)
@@ -0,0 +1,117 @@
+"""
+Inkrementeller Abgleich für Clients mit lokalem Cache (/api/sync/).
+
+Ein Client lädt einmal alles (ohne since) und danach mit dem zuletzt
+erhaltenen token nur noch Pflanzen, Zyklen, Events und Tasks, deren
+updated_at seit dem Token liegt, sowie die seitdem gelöschten IDs aus der
+Tombstone-Tabelle.
+
+- Das Token wird vor dem Lesen genommen und das Zeitfenster um
+  PLANTS_SYNC_OVERLAP Sekunden nach vorne erweitert, damit Änderungen aus
+  Transaktionen, die erst nach dem Lesen committet wurden, beim nächsten
+  Abgleich dabei sind. Datensätze können deshalb doppelt kommen; der Client
+  überschreibt sie einfach.
+- Ist das Token älter als PLANTS_SYNC_RETENTION_DAYS (Löschvermerke sind
+  dann evtl. schon aufgeräumt), kommt wie beim ersten Abgleich alles mit
+  reset=True, der Client verwirft seinen Cache.
+- Ausgegeben werden nur gespeicherte Felder. Abgeleitete Werte wie
+  cycle_count oder plant_name ändern sich, ohne dass sich updated_at der
+  Zeile ändert, und werden vom Client aus den übrigen Daten berechnet.
+
+Zuerst deleted anwenden, dann die geänderten Datensätze.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Plant, PlantingCycle, Event, Task, Tombstone
+from .serializers import PlantSerializer, PlantingCycleSerializer, EventSerializer, TaskSerializer
+from .sparse_fields import FieldSelection
+
+SYNC_MODELS = {
+    'plants': Plant,
+    'cycles': PlantingCycle,
+    'events': Event,
+    'tasks': Task,
+}
+
+MODEL_KEYS = {model: key for key, model in SYNC_MODELS.items()}
+
+# Serializer und Felder je Tabelle (None = alle Felder)
+SYNC_SERIALIZERS = {
+    'plants': (PlantSerializer, {
+        'id', 'name', 'variety', 'seed_source', 'notes', 'created_at', 'updated_at'
+    }),
+    'cycles': (PlantingCycleSerializer, {
+        'id', 'plant', 'year', 'status', 'status_display', 'seed_saved',
+        'seed_saved_notes', 'created_at', 'updated_at'
+    }),
+    'events': (EventSerializer, None),
+    'tasks': (TaskSerializer, None),
+}
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def make_token(moment):
+    """Zeitpunkt als Token (Mikrosekunden seit 1970, URL-sicher)"""
+    return str((moment - EPOCH) // timedelta(microseconds=1))
+
+
+def parse_token(token):
+    try:
+        return EPOCH + timedelta(microseconds=int(token))
+    except (TypeError, ValueError, OverflowError):
+        raise InvalidToken(token)
+
+
+def record_deletion(model, pk):
+    """Löschvermerk für einen Datensatz einer Sync-Tabelle"""
+    Tombstone.objects.create(model=MODEL_KEYS[model], object_id=pk)
+
+
+def record_deletions(model, pks):
+    """Löschvermerke für mehrere Datensätze mit einem INSERT"""
+    Tombstone.objects.bulk_create(
+        [Tombstone(model=MODEL_KEYS[model], object_id=pk) for pk in pks],
+        batch_size=500,
+    )
+
+
+def prune_tombstones(now=None):
+    """Löschvermerke außerhalb der Aufbewahrungsfrist entfernen"""
+    cutoff = (now or timezone.now()) - timedelta(days=settings.PLANTS_SYNC_RETENTION_DAYS)
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
+
+
+def changes_since(token=None):
+    """Änderungen seit token bzw. alles, siehe Modul-Docstring"""
+    now = timezone.now()
+    since = parse_token(token) if token else None
+    reset = since is None or since < now - timedelta(days=settings.PLANTS_SYNC_RETENTION_DAYS)
+    start = None if reset else since - timedelta(seconds=settings.PLANTS_SYNC_OVERLAP)
+
+    changes = {'token': make_token(now), 'reset': reset}
+    for key, model in SYNC_MODELS.items():
+        # Nach pk statt Meta.ordering, das bei Zyklen einen Join bräuchte
+        queryset = model.objects.order_by('pk')
+        if start is not None:
+            queryset = queryset.filter(updated_at__gte=start)
+        serializer_class, fields = SYNC_SERIALIZERS[key]
+        changes[key] = serializer_class(
+            queryset, many=True, field_selection=FieldSelection(fields=fields)
+        ).data
+
+    deleted = {key: [] for key in SYNC_MODELS}
+    if start is not None:
+        rows = Tombstone.objects.filter(deleted_at__gte=start).values_list('model', 'object_id')
+        for key, object_id in rows:
+            deleted[key].append(object_id)
+    changes['deleted'] = deleted
+    return changes
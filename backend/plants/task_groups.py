@@ -0,0 +1,99 @@
+"""
+Aufgaben gruppiert nach Fälligkeit für die Aufgabenliste.
+
+Gruppen: überfällig, heute, diese Woche (bis Sonntag), später (inkl. ohne
+Datum) und erledigt. Die Anzahl pro Gruppe kommt aus einer Aggregat-Query
+mit Count(filter=...), die Aufgaben selbst aus einer zweiten Query, die pro
+Gruppe per ROW_NUMBER() OVER (PARTITION BY Gruppe) auf limit Zeilen
+begrenzt wird. Der Aufwand hängt also nicht von der Anzahl erledigter
+Aufgaben ab.
+"""
+from datetime import timedelta
+
+from django.db.models import Case, CharField, Count, F, Q, Value, When, Window
+from django.db.models.functions import RowNumber
+
+TASK_GROUP_LABELS = {
+    'overdue': 'Überfällig',
+    'today': 'Heute',
+    'week': 'Diese Woche',
+    'later': 'Später',
+    'done': 'Erledigt',
+}
+
+# Offene Aufgaben nach Fälligkeit, erledigte zuletzt erledigt zuerst
+GROUP_ORDERING = [
+    F('completed_at').desc(nulls_last=True),
+    F('due_date').asc(nulls_last=True),
+    F('priority_rank').asc(),
+    F('id').asc(),
+]
+
+
+def group_filters(today):
+    """Bedingung je Gruppe, in der Reihenfolge von TASK_GROUP_LABELS"""
+    week_end = today + timedelta(days=6 - today.weekday())
+    open_tasks = Q(completed=False)
+    return {
+        'overdue': open_tasks & Q(due_date__lt=today),
+        'today': open_tasks & Q(due_date=today),
+        'week': open_tasks & Q(due_date__gt=today, due_date__lte=week_end),
+        'later': open_tasks & (Q(due_date__gt=week_end) | Q(due_date__isnull=True)),
+        'done': Q(completed=True),
+    }
+
+
+def group_counts(queryset, today):
+    """Anzahl je Gruppe mit einer Query"""
+    counts = queryset.order_by().aggregate(**{
+        key: Count('id', filter=condition)
+        for key, condition in group_filters(today).items()
+    })
+    counts['total'] = sum(counts.values())
+    return counts
+
+
+def grouped_tasks(queryset, today, keys, limit):
+    """Höchstens limit Aufgaben je Gruppe in keys, {Gruppe: [Task, ...]}"""
+    filters = group_filters(today)
+    condition = Q()
+    for key in keys:
+        condition |= filters[key]
+    tasks = (
+        queryset.filter(condition)
+        .annotate(
+            task_group=Case(
+                *[When(filters[key], then=Value(key)) for key in keys],
+                output_field=CharField(),
+            ),
+        )
+        .annotate(
+            group_row=Window(
+                RowNumber(),
+                partition_by=[F('task_group')],
+                order_by=GROUP_ORDERING,
+            ),
+        )
+        .filter(group_row__lte=limit)
+        .order_by('group_row')
+    )
+    groups = {key: [] for key in keys}
+    for task in tasks:
+        groups[task.task_group].append(task)
+    return groups
+
+
+def task_groups(queryset, today, keys=None, limit=20):
+    """Gruppen mit Anzahl und den ersten limit Aufgaben (Task-Instanzen)"""
+    keys = keys or list(TASK_GROUP_LABELS)
+    counts = group_counts(queryset, today)
+    tasks = grouped_tasks(queryset, today, keys, limit)
+    return counts, [
+        {
+            'key': key,
+            'label': TASK_GROUP_LABELS[key],
+            'count': counts[key],
+            'results': tasks[key],
+        }
+        for key in keys
+    ]
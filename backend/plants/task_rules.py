@@ -0,0 +1,196 @@
+"""
+Automatische Aufgaben aus Ereignissen.
+
+Eine Regel erzeugt zu einem Event eines bestimmten Typs eine oder mehrere
+Aufgaben, z.B. Aussaat -> "Pikieren" nach 21 Tagen oder Auspflanzen ->
+regelmäßig Gießen. Erzeugte Aufgaben merken sich Event, Regel und
+Wiederholung (source_event, rule, rule_step); daran werden bereits
+vorhandene Aufgaben erkannt, mehrfaches Ausführen legt nichts doppelt an.
+Das gilt auch, wenn eine erzeugte Aufgabe verschoben oder erledigt wurde.
+Gelöschte erzeugte Aufgaben werden in DismissedTask vermerkt und ebenfalls
+nicht neu angelegt.
+
+Aufgaben werden nur für Zyklen angelegt, die nicht abgeschlossen sind, und
+standardmäßig nur, wenn sie heute oder später fällig sind. Nachgetragene
+Events aus der Vergangenheit erzeugen so keine Liste überfälliger Aufgaben.
+"""
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import DismissedTask, Event, PlantingCycle, Task
+
+TaskRule = namedtuple(
+    'TaskRule',
+    ['key', 'event_type', 'title', 'days_after', 'priority', 'repeat_every', 'repeat_count', 'description'],
+    defaults=['medium', None, 1, '']
+)
+
+TASK_RULES = [
+    TaskRule(
+        'check_germination', 'sowing', 'Keimung prüfen: {plant}', 10, 'low',
+        description='Ist die Aussaat aufgegangen? Sonst nachsäen.'
+    ),
+    TaskRule(
+        'prick_out', 'sowing', 'Pikieren: {plant}', 21,
+        description='Sämlinge in einzelne Töpfe umsetzen.'
+    ),
+    TaskRule(
+        'water_after_transplanting', 'transplanting', 'Gießen: {plant}', 1
+    ),
+    TaskRule(
+        'water', 'planting_out', 'Gießen: {plant}', 2, 'high', repeat_every=3, repeat_count=5,
+        description='Frisch ausgepflanzt, in den ersten Wochen regelmäßig gießen.'
+    ),
+    TaskRule(
+        'fertilize', 'planting_out', 'Düngen: {plant}', 28, 'low'
+    ),
+]
+
+RULES_BY_EVENT_TYPE = {}
+for _rule in TASK_RULES:
+    RULES_BY_EVENT_TYPE.setdefault(_rule.event_type, []).append(_rule)
+
+# Abstand zwischen Event und letzter erzeugter Aufgabe
+MAX_RULE_SPAN = max(
+    rule.days_after + (rule.repeat_every or 0) * (rule.repeat_count - 1)
+    for rule in TASK_RULES
+)
+
+
+def auto_tasks_enabled():
+    """Aufgaben beim Anlegen von Events erzeugen? (PLANTS_AUTO_TASKS)"""
+    return getattr(settings, 'PLANTS_AUTO_TASKS', True)
+
+
+def plant_label(name, variety):
+    if variety:
+        return f"{name} ({variety})"
+    return name
+
+
+def planned_tasks(event_id, cycle_id, event_type, event_date, label, today=None):
+    """Aufgaben, die die Regeln zu einem Event vorsehen (ungespeichert)"""
+    for rule in RULES_BY_EVENT_TYPE.get(event_type, ()):
+        for step in range(rule.repeat_count):
+            due_date = event_date + timedelta(days=rule.days_after + (rule.repeat_every or 0) * step)
+            if today is not None and due_date < today:
+                continue
+            yield Task(
+                planting_cycle_id=cycle_id,
+                source_event_id=event_id,
+                rule=rule.key,
+                rule_step=step,
+                title=rule.title.format(plant=label),
+                description=rule.description,
+                due_date=due_date,
+                priority=rule.priority,
+                priority_rank=Task.PRIORITY_RANKS[rule.priority],
+            )
+
+
+def create_missing(tasks, existing_keys):
+    """Aufgaben anlegen, deren (Event, Regel, Wiederholung) noch nicht existiert"""
+    tasks = [
+        task for task in tasks
+        if (task.source_event_id, task.rule, task.rule_step) not in existing_keys
+    ]
+    if not tasks:
+        return 0
+    # ignore_conflicts fängt parallel angelegte Aufgaben über den Unique-Constraint ab
+    Task.objects.bulk_create(tasks, batch_size=500, ignore_conflicts=True)
+    # bulk_writes importiert dieses Modul
+    from .bulk_writes import after_bulk_write
+
+    after_bulk_write([Task])
+    return len(tasks)
+
+
+def existing_rule_keys(events):
+    """Schlüssel vorhandener und vom Benutzer gelöschter Aufgaben"""
+    keys = set(
+        Task.objects
+        .filter(source_event__in=events)
+        .values_list('source_event_id', 'rule', 'rule_step')
+    )
+    keys.update(
+        DismissedTask.objects
+        .filter(source_event__in=events)
+        .values_list('source_event_id', 'rule', 'rule_step')
+    )
+    return keys
+
+
+def dismiss(tasks):
+    """Gelöschte erzeugte Aufgaben vermerken, damit sie nicht neu entstehen"""
+    DismissedTask.objects.bulk_create(
+        [
+            DismissedTask(source_event_id=task.source_event_id, rule=task.rule, rule_step=task.rule_step)
+            for task in tasks
+            if task.source_event_id and task.rule
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def generate_for_events(events, include_past=False):
+    """Aufgaben zu neu angelegten Events erzeugen, gibt die Anzahl zurück"""
+    events = [event for event in events if event.event_type in RULES_BY_EVENT_TYPE]
+    if not events or not auto_tasks_enabled():
+        return 0
+
+    today = None if include_past else timezone.localdate()
+    cycles = {
+        cycle_id: plant_label(name, variety)
+        for cycle_id, name, variety in (
+            PlantingCycle.objects
+            .filter(pk__in={event.planting_cycle_id for event in events})
+            .exclude(status='finished')
+            .values_list('id', 'plant__name', 'plant__variety')
+        )
+    }
+    tasks = []
+    for event in events:
+        if event.planting_cycle_id not in cycles:
+            continue
+        event_date = Event._meta.get_field('event_date').to_python(event.event_date)
+        tasks.extend(planned_tasks(
+            event.pk, event.planting_cycle_id, event.event_type, event_date,
+            cycles[event.planting_cycle_id], today
+        ))
+    if not tasks:
+        return 0
+    return create_missing(tasks, existing_rule_keys([event.pk for event in events]))
+
+
+def generate_all(include_past=False):
+    """
+    Regeln für alle Events aktiver Zyklen auswerten.
+
+    Eine Query für die auslösenden Events (mit Pflanze), eine für die
+    bereits erzeugten Aufgaben, danach gebündelte INSERTs.
+    """
+    events = (
+        Event.objects
+        .filter(event_type__in=RULES_BY_EVENT_TYPE)
+        .exclude(planting_cycle__status='finished')
+    )
+    today = None
+    if not include_past:
+        today = timezone.localdate()
+        events = events.filter(event_date__gte=today - timedelta(days=MAX_RULE_SPAN))
+
+    rows = events.order_by().values_list(
+        'id', 'planting_cycle_id', 'event_type', 'event_date',
+        'planting_cycle__plant__name', 'planting_cycle__plant__variety'
+    )
+    tasks = []
+    for event_id, cycle_id, event_type, event_date, name, variety in rows:
+        tasks.extend(planned_tasks(
+            event_id, cycle_id, event_type, event_date, plant_label(name, variety), today
+        ))
+    if not tasks:
+        return 0
+    return create_missing(tasks, existing_rule_keys(events.values('id')))
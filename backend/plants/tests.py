@@ -0,0 +1,748 @@
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+
+from .analytics import rebuild_rollups
+from .cache import get_model_states
+from .conditional import ConditionalGetMixin
+from .models import Plant, PlantingCycle, Event, EventRollup, Task, Tombstone
+from .urls import router
+
+
+def results(response):
+    """Liste aus einer (ggf. paginierten) Antwort"""
+    data = response.json()
+    return data['results'] if isinstance(data, dict) else data
+
+
+class GardenTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        # Änderungsstände anlegen, sonst zählt die erste Änderung deren INSERT mit
+        get_model_states([Plant, PlantingCycle, Event, Task])
+        self.client = APIClient()
+
+
+class EventDeletionTests(GardenTestCase):
+    def test_deleted_event_updates_tasks_and_sync(self):
+        plant = Plant.objects.create(name='Tomate', variety='Ochsenherz')
+        cycle = PlantingCycle.objects.create(plant=plant, year=date.today().year)
+        response = self.client.post(
+            f'/api/cycles/{cycle.id}/add_event/',
+            {'event_type': 'sowing', 'event_date': date.today().isoformat()},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        event = Event.objects.get()
+        task_ids = set(Task.objects.filter(source_event=event).values_list('id', flat=True))
+        self.assertTrue(task_ids)
+
+        # Liste und Sync-Stand vor dem Löschen, die Liste landet im Cache
+        tasks = results(self.client.get('/api/tasks/'))
+        self.assertEqual({task['source_event'] for task in tasks}, {event.id})
+        token = self.client.get('/api/sync/').json()['token']
+
+        response = self.client.delete(f'/api/events/{event.id}/')
+        self.assertEqual(response.status_code, 204)
+
+        tasks = results(self.client.get('/api/tasks/'))
+        self.assertEqual({task['source_event'] for task in tasks}, {None})
+
+        delta = self.client.get('/api/sync/', {'since': token}).json()
+        self.assertFalse(delta['reset'])
+        self.assertEqual(delta['deleted']['events'], [event.id])
+        changed = {task['id']: task for task in delta['tasks']}
+        self.assertTrue(task_ids <= set(changed))
+        self.assertTrue(all(changed[pk]['source_event'] is None for pk in task_ids))
+
+
+class CascadeDeleteTests(GardenTestCase):
+    def create_plant(self, events):
+        plant = Plant.objects.create(name='Bohne')
+        for year in (2023, 2024):
+            cycle = PlantingCycle.objects.create(plant=plant, year=year)
+            Event.objects.bulk_create([
+                Event(planting_cycle=cycle, event_type='harvest', event_date=date(year, 1 + i % 12, 1), quantity=1)
+                for i in range(events)
+            ])
+        rebuild_rollups()
+        return plant
+
+    def delete_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.delete(url)
+        self.assertEqual(response.status_code, 204)
+        return len(context.captured_queries)
+
+    def test_plant_delete_does_not_scale_with_events(self):
+        small = self.delete_queries(f'/api/plants/{self.create_plant(5).id}/')
+        large = self.delete_queries(f'/api/plants/{self.create_plant(50).id}/')
+        self.assertEqual(small, large)
+        self.assertEqual(Tombstone.objects.filter(model='events').count(), 110)
+
+    def test_cycle_delete_rebuilds_rollups_once(self):
+        plant = self.create_plant(24)
+        cycle = plant.cycles.get(year=2023)
+        queries = self.delete_queries(f'/api/cycles/{cycle.id}/')
+        self.assertLess(queries, 40)
+        self.assertEqual(
+            set(EventRollup.objects.values_list('year', 'event_count')),
+            {(2024, 2)},
+        )
+
+
+@override_settings(PLANTS_RESPONSE_CACHE=False)
+class PlantQueryCountTests(GardenTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(60):
+            plant = Plant.objects.create(name=f'Pflanze {i:02d}', variety='Sorte')
+            for year in (2023, 2024):
+                cycle = PlantingCycle.objects.create(plant=plant, year=year)
+                Event.objects.create(planting_cycle=cycle, event_type='sowing', event_date=date(year, 3, 1))
+                Task.objects.create(planting_cycle=cycle, title='Gießen')
+
+    def list_queries(self, page_size):
+        with mock.patch.object(PageNumberPagination, 'page_size', page_size):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get('/api/plants/')
+        self.assertEqual(len(response.json()['results']), page_size)
+        return len(context.captured_queries)
+
+    def test_plant_list_queries_do_not_depend_on_page_size(self):
+        self.assertEqual(self.list_queries(5), self.list_queries(50))
+
+    def assert_detail_queries(self, plant, cycles):
+        # Pflanze, Zyklen, Events, Tasks und die Änderungsstände für den ETag
+        with self.assertNumQueries(5):
+            response = self.client.get(f'/api/plants/{plant.id}/')
+        self.assertEqual(len(response.json()['cycles']), cycles)
+
+    def test_plant_detail_queries_do_not_depend_on_cycle_count(self):
+        plant = Plant.objects.create(name='Kürbis')
+        PlantingCycle.objects.create(plant=plant, year=2024)
+        self.assert_detail_queries(plant, 1)
+
+        for year in range(2010, 2023):
+            cycle = PlantingCycle.objects.create(plant=plant, year=year)
+            Event.objects.create(planting_cycle=cycle, event_type='harvest', event_date=date(year, 8, 1))
+            Task.objects.create(planting_cycle=cycle, title='Ernten')
+        self.assert_detail_queries(plant, 14)
+
+
+@override_settings(PLANTS_RESPONSE_CACHE=False)
+class ListQueryTests(GardenTestCase):
+    def test_event_and_task_lists_do_not_join_cycles(self):
+        plant = Plant.objects.create(name='Gurke')
+        cycle = PlantingCycle.objects.create(plant=plant, year=2024)
+        Event.objects.create(planting_cycle=cycle, event_type='harvest', event_date=date(2024, 7, 1))
+        Task.objects.create(planting_cycle=cycle, title='Ernten')
+
+        # Die Serializer geben planting_cycle nur als ID aus
+        for url in ['/api/events/', '/api/tasks/']:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.get(url)
+                self.assertEqual(results(response)[0]['planting_cycle'], cycle.id)
+                for query in context.captured_queries:
+                    self.assertNotIn('JOIN', query['sql'])
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN gibt es nur unter SQLite')
+@override_settings(PLANTS_RESPONSE_CACHE=False)
+class QueryPlanTests(GardenTestCase):
+    def setUp(self):
+        super().setUp()
+        plant = Plant.objects.create(name='Zucchini')
+        cycle = PlantingCycle.objects.create(plant=plant, year=date.today().year)
+        for day in range(1, 6):
+            Event.objects.create(planting_cycle=cycle, event_type='harvest', event_date=date(2024, 7, day))
+            Task.objects.create(planting_cycle=cycle, title='Ernten', due_date=date(2024, 7, day))
+        self.cycle = cycle
+
+    def query_plan(self, url):
+        """EXPLAIN QUERY PLAN aller SELECTs eines Requests als ein Text"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        details = []
+        with connection.cursor() as cursor:
+            for query in context.captured_queries:
+                if query['sql'].startswith('SELECT'):
+                    cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                    details.extend(row[-1] for row in cursor.fetchall())
+        return '\n'.join(details)
+
+    def test_list_and_dashboard_queries_use_indexes(self):
+        expected = {
+            f'/api/events/?cycle={self.cycle.id}': ['event_cycle_date_idx'],
+            '/api/events/?type=harvest': ['event_type_date_idx'],
+            '/api/events/?date_from=2024-07-02': ['event_date_created_idx'],
+            '/api/tasks/?completed=false': ['task_completed_due_idx', 'task_priority_due_idx'],
+            '/api/tasks/?overdue=true': ['task_completed_due_idx', 'task_priority_due_idx'],
+            '/api/dashboard/stats/': [
+                'cycle_year_status_idx', 'event_date_created_idx', 'task_priority_due_idx',
+            ],
+        }
+        for url, indexes in expected.items():
+            plan = self.query_plan(url)
+            for index in indexes:
+                with self.subTest(url=url, index=index):
+                    self.assertIn(index, plan)
+
+
+class ImportTests(GardenTestCase):
+    def upload(self, content, name='tasks.csv', model='tasks'):
+        return self.client.post(
+            '/api/import/',
+            {'file': SimpleUploadedFile(name, content), 'model': model},
+            format='multipart',
+        )
+
+    def test_empty_cells_use_field_defaults(self):
+        response = self.upload(
+            'plant_name,year,title,priority,completed\n'
+            'Tomate,2024,Ausgeizen,,\n'.encode('utf-8')
+        )
+        self.assertEqual(response.status_code, 201, response.json())
+        task = Task.objects.get()
+        self.assertEqual((task.priority, task.completed), ('medium', False))
+
+    def test_non_utf8_upload_is_rejected(self):
+        for content in ['plant_name,title\nMöhre,Säen\n'.encode('latin-1'), b'\x89PNG\r\n\x1a\n\xff\xfe']:
+            with self.subTest(content=content):
+                response = self.upload(content)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('UTF-8', response.json()['file'])
+        self.assertFalse(Plant.objects.exists())
+
+
+class ResponseCacheTests(GardenTestCase):
+    def setUp(self):
+        super().setUp()
+        self.bean = Plant.objects.create(name='Bohne')
+        self.pea = Plant.objects.create(name='Erbse')
+        self.cycle = PlantingCycle.objects.create(plant=self.bean, year=2024)
+        self.event = Event.objects.create(
+            planting_cycle=self.cycle, event_type='harvest', event_date=date(2024, 7, 1), quantity=2,
+            notes='Mehltau an den Blättern'
+        )
+
+    def test_event_list_follows_moved_cycle(self):
+        url = f'/api/events/?plant={self.pea.id}'
+        before = self.client.get(url)
+        self.assertEqual(before.json()['count'], 0)
+
+        response = self.client.patch(f'/api/cycles/{self.cycle.id}/', {'plant': self.pea.id}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        after = self.client.get(url, HTTP_IF_NONE_MATCH=before['ETag'])
+        self.assertEqual(after.status_code, 200)
+        self.assertEqual(after.json()['count'], 1)
+
+    def test_cached_responses_follow_related_writes(self):
+        plant_url = f'/api/plants/{self.bean.id}/'
+        cycle_url = f'/api/cycles/{self.cycle.id}/'
+        task = Task.objects.create(planting_cycle=self.cycle, title='Pflücken')
+        # Einträge im Response-Cache anlegen
+        self.assertEqual(self.client.get(plant_url).json()['cycle_count'], 1)
+        self.assertEqual(len(self.client.get(cycle_url).json()['events']), 1)
+        self.assertEqual(self.client.get(plant_url).json()['cycles'][0]['tasks'][0]['completed'], False)
+
+        responses = [
+            self.client.post('/api/cycles/', {'plant': self.bean.id, 'year': 2025}, format='json'),
+            self.client.post(
+                f'/api/cycles/{self.cycle.id}/add_event/',
+                {'event_type': 'watering', 'event_date': '2024-07-02'}, format='json'
+            ),
+            self.client.post(f'/api/tasks/{task.id}/toggle_complete/'),
+        ]
+        self.assertEqual([response.status_code for response in responses], [201, 201, 200])
+
+        plant = self.client.get(plant_url).json()
+        self.assertEqual(plant['cycle_count'], 2)
+        cycle = next(cycle for cycle in plant['cycles'] if cycle['id'] == self.cycle.id)
+        self.assertEqual([task['completed'] for task in cycle['tasks']], [True])
+        self.assertEqual(len(self.client.get(cycle_url).json()['events']), 2)
+
+    def move_cycle(self):
+        response = self.client.patch(f'/api/cycles/{self.cycle.id}/', {'plant': self.pea.id}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_rollups_follow_moved_cycle(self):
+        rebuild_rollups()
+        self.move_cycle()
+        for plant, count in ((self.bean, []), (self.pea, [1])):
+            response = self.client.get('/api/analytics/', {'plant': plant.id, 'type': 'harvest'})
+            self.assertEqual([row['event_count'] for row in response.json()], count)
+
+    def test_search_follows_moved_cycle(self):
+        self.move_cycle()
+        response = self.client.get('/api/plants/', {'search': 'Mehltau'})
+        self.assertEqual([plant['name'] for plant in results(response)], ['Erbse'])
+
+    def test_analytics_revalidate_after_rollup_rebuild(self):
+        # Abweichende Summen, z.B. nach einem Fehler
+        EventRollup.objects.update(event_count=5)
+        first = self.client.get('/api/analytics/', {'type': 'harvest'})
+        self.assertEqual([row['event_count'] for row in first.json()], [5])
+        call_command('rebuild_rollups', stdout=StringIO())
+        second = self.client.get('/api/analytics/', {'type': 'harvest'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual([row['event_count'] for row in second.json()], [1])
+
+    def test_analytics_rejects_non_numeric_filters(self):
+        for params in ({'year': 'abc'}, {'plant': 'abc'}, {'year': '-1'}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/analytics/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(list(response.json()), list(params))
+
+    def login_admin(self):
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'geheim')
+        self.client.force_authenticate(admin)
+
+    def test_cache_stats_are_not_revalidated(self):
+        self.login_admin()
+        first = self.client.get('/api/dashboard/cache_stats/')
+        self.assertNotIn('ETag', first)
+        self.client.get('/api/plants/')
+        self.client.get('/api/plants/')
+        second = self.client.get('/api/dashboard/cache_stats/', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json()['plant']['list'], {'hits': 1, 'misses': 1})
+
+    @override_settings(PLANTS_INSTRUMENTATION=True)
+    def test_request_stats_are_not_revalidated(self):
+        self.login_admin()
+        first = self.client.get('/api/dashboard/request_stats/')
+        self.assertNotIn('ETag', first)
+        self.client.get('/api/plants/')
+        second = self.client.get('/api/dashboard/request_stats/', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(second.status_code, 200)
+        self.assertTrue(any(route['requests'] for route in second.json()['routes'].values()))
+
+
+class TaskRuleTests(GardenTestCase):
+    def test_deleted_generated_task_is_not_recreated(self):
+        plant = Plant.objects.create(name='Gurke')
+        cycle = PlantingCycle.objects.create(plant=plant, year=date.today().year)
+        Event.objects.create(planting_cycle=cycle, event_type='planting_out', event_date=date.today())
+        generated = Task.objects.filter(rule__gt='').count()
+        self.assertGreater(generated, 1)
+
+        task = Task.objects.filter(rule='water').order_by('rule_step').last()
+        self.assertEqual(self.client.delete(f'/api/tasks/{task.id}/').status_code, 204)
+        call_command('generate_tasks', stdout=StringIO())
+
+        self.assertEqual(Task.objects.filter(rule__gt='').count(), generated - 1)
+        self.assertFalse(Task.objects.filter(rule='water', rule_step=task.rule_step).exists())
+
+
+class ConditionalGetTests(GardenTestCase):
+    """ETag/304 für alle Endpunkte mit ConditionalGetMixin"""
+    URLS = {
+        'plant': '/api/plants/',
+        'plantingcycle': '/api/cycles/',
+        'event': '/api/events/',
+        'task': '/api/tasks/',
+        'dashboard': '/api/dashboard/stats/',
+        'analytics': '/api/analytics/',
+        'lookup': '/api/lookup/',
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.plant = Plant.objects.create(name='Salat')
+        self.cycle = PlantingCycle.objects.create(plant=self.plant, year=2024)
+        self.event = Event.objects.create(planting_cycle=self.cycle, event_type='watering', event_date=date(2024, 5, 1))
+        self.task = Task.objects.create(planting_cycle=self.cycle, title='Hacken')
+
+    def write(self, model):
+        """Eine Änderung an model wie über die API bzw. einen Befehl"""
+        if model is EventRollup:
+            rebuild_rollups()
+        else:
+            instance = {Plant: self.plant, PlantingCycle: self.cycle, Event: self.event, Task: self.task}[model]
+            instance.save()
+
+    def conditional_routes(self):
+        for _, viewset, basename in router.registry:
+            if issubclass(viewset, ConditionalGetMixin):
+                yield self.URLS[basename], viewset.conditional_models
+
+    def test_unchanged_data_is_not_modified(self):
+        for url, _ in self.conditional_routes():
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertEqual(first.status_code, 200)
+                second = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+                self.assertEqual(second.status_code, 304)
+                self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_write_to_each_conditional_model_revalidates(self):
+        for url, models in self.conditional_routes():
+            for model in models:
+                with self.subTest(url=url, model=model.__name__):
+                    etag = self.client.get(url)['ETag']
+                    self.write(model)
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertNotEqual(response['ETag'], etag)
+
+    def test_dashboard_cache_hit_only_reads_model_states(self):
+        first = self.client.get('/api/dashboard/stats/').json()
+        # Änderungsstände für den ETag, der zugleich den Cache-Key bildet
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/api/dashboard/stats/').json(), first)
+
+        Plant.objects.create(name='Rucola')
+        second = self.client.get('/api/dashboard/stats/').json()
+        self.assertNotEqual(second, first)
+
+
+@override_settings(PLANTS_RESPONSE_CACHE=False)
+class CursorPaginationTests(GardenTestCase):
+    def setUp(self):
+        super().setUp()
+        plant = Plant.objects.create(name='Mais')
+        cycle = PlantingCycle.objects.create(plant=plant, year=2024)
+        # Gleiche Daten und Zeitstempel derselben Millisekunde
+        created_at = timezone.now()
+        Event.objects.bulk_create([
+            Event(
+                planting_cycle=cycle, event_type='watering', event_date=date(2024, 6, 1 + i % 3),
+                created_at=created_at + timedelta(microseconds=i * 10)
+            )
+            for i in range(40)
+        ])
+        Task.objects.bulk_create([
+            Task(
+                planting_cycle=cycle, title=f'Aufgabe {i}', priority=priority,
+                priority_rank=Task.PRIORITY_RANKS[priority], completed=i % 4 == 0,
+                due_date=date(2024, 6, 1 + i % 5) if i % 3 else None
+            )
+            for i, priority in enumerate(['low', 'medium', 'high'] * 10)
+        ])
+
+    def traverse(self, url):
+        ids, pages = [], 0
+        while url:
+            data = self.client.get(url).json()
+            self.assertNotIn('count', data)
+            ids.extend(item['id'] for item in data['results'])
+            url, pages = data['next'], pages + 1
+        return ids, pages
+
+    def test_traversal_has_no_gaps_or_duplicates(self):
+        for url, model in (('/api/events/', Event), ('/api/tasks/', Task)):
+            with self.subTest(url=url):
+                ids, pages = self.traverse(f'{url}?pagination=cursor&page_size=7')
+                expected = list(model.objects.order_by(*model._meta.ordering, 'id').values_list('id', flat=True))
+                self.assertEqual(ids, expected)
+                self.assertEqual(pages, -(-len(expected) // 7))
+
+    def test_invalid_cursor_is_not_found(self):
+        # [1,2,3], ["x","y","z"], kein Base64, falsche Länge
+        for cursor in ['WzEsMiwzXQ==', 'WyJ4IiwieSIsInoiXQ==', '%%%', 'WzFd']:
+            with self.subTest(cursor=cursor):
+                response = self.client.get('/api/events/', {'pagination': 'cursor', 'cursor': cursor})
+                self.assertEqual(response.status_code, 404)
+
+
+class BulkEventTests(GardenTestCase):
+    def setUp(self):
+        super().setUp()
+        plant = Plant.objects.create(name='Kartoffel')
+        self.cycles = [PlantingCycle.objects.create(plant=plant, year=year) for year in (2023, 2024)]
+
+    def post(self, data):
+        return self.client.post('/api/events/bulk/', data, format='json')
+
+    def test_one_invalid_item_rejects_the_whole_batch(self):
+        response = self.post([
+            {'planting_cycle': self.cycles[0].id, 'event_type': 'harvest', 'event_date': '2023-08-01'},
+            {'planting_cycle': 999999, 'event_type': 'bogus', 'event_date': '2023-08-02'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(errors[0], {})
+        self.assertEqual(set(errors[1]), {'planting_cycle', 'event_type'})
+        self.assertFalse(Event.objects.exists())
+
+    def test_batch_across_cycles_runs_event_side_effects(self):
+        response = self.post([
+            {'planting_cycle': cycle.id, 'event_type': 'harvest', 'event_date': f'{cycle.year}-08-01', 'quantity': 2}
+            for cycle in self.cycles
+        ])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()), 2)
+        self.assertEqual(
+            set(PlantingCycle.objects.values_list('status', flat=True)), {'harvesting'}
+        )
+        self.assertEqual(
+            sorted(EventRollup.objects.values_list('year', 'event_count')), [(2023, 1), (2024, 1)]
+        )
+
+    def test_non_list_body_is_rejected(self):
+        self.assertEqual(self.post({'event_type': 'harvest'}).status_code, 400)
+        self.assertEqual(self.post([]).status_code, 400)
+
+
+class BulkTaskTests(GardenTestCase):
+    def setUp(self):
+        super().setUp()
+        plant = Plant.objects.create(name='Paprika')
+        self.cycle = PlantingCycle.objects.create(plant=plant, year=2024)
+        other = PlantingCycle.objects.create(plant=plant, year=2023)
+        self.tasks = [Task.objects.create(planting_cycle=self.cycle, title=f'Aufgabe {i}') for i in range(3)]
+        self.other = Task.objects.create(planting_cycle=other, title='Alt')
+
+    def post(self, data):
+        return self.client.post('/api/tasks/bulk/', data, format='json')
+
+    def test_complete_by_ids(self):
+        ids = [task.id for task in self.tasks[:2]]
+        response = self.post({'action': 'complete', 'ids': ids})
+        self.assertEqual(response.json(), {'updated': 2})
+        completed = Task.objects.filter(completed=True)
+        self.assertEqual(sorted(completed.values_list('id', flat=True)), ids)
+        self.assertTrue(all(task.completed_at for task in completed))
+
+    def test_reprioritize_by_filter_updates_rank(self):
+        response = self.post({'action': 'reprioritize', 'priority': 'high', 'filter': {'cycle': self.cycle.id}})
+        self.assertEqual(response.json(), {'updated': 3})
+        self.assertEqual(
+            set(Task.objects.filter(planting_cycle=self.cycle).values_list('priority', 'priority_rank')),
+            {('high', Task.PRIORITY_RANKS['high'])}
+        )
+        self.assertEqual(Task.objects.get(pk=self.other.pk).priority, 'medium')
+
+    def test_invalid_requests_change_nothing(self):
+        for data in [
+            {'action': 'complete', 'filter': {}},
+            {'action': 'complete', 'filter': {'foo': 1}},
+            {'action': 'complete', 'filter': {'cycle': 'abc'}},
+            {'action': 'complete', 'filter': {'overdue': False}},
+            {'action': 'complete', 'ids': [1], 'filter': {'completed': False}},
+            {'action': 'reschedule', 'ids': [self.other.id]},
+        ]:
+            with self.subTest(data=data):
+                self.assertEqual(self.post(data).status_code, 400)
+        self.assertFalse(Task.objects.filter(completed=True).exists())
+
+
+class CycleStatusTests(GardenTestCase):
+    def setUp(self):
+        super().setUp()
+        plant = Plant.objects.create(name='Zucchini')
+        self.cycle = PlantingCycle.objects.create(plant=plant, year=2024)
+
+    def add_event(self, event_type, event_date):
+        response = self.client.post(
+            f'/api/cycles/{self.cycle.id}/add_event/',
+            {'event_type': event_type, 'event_date': event_date}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.cycle.refresh_from_db()
+        return self.cycle.status
+
+    def test_events_advance_status_forward(self):
+        self.assertEqual(self.cycle.status, 'planning')
+        self.assertEqual(self.add_event('watering', '2024-03-01'), 'planning')
+        self.assertEqual(self.add_event('sowing', '2024-03-10'), 'sowing')
+        self.assertEqual(self.add_event('germination', '2024-03-20'), 'germinating')
+        self.assertEqual(self.add_event('planting_out', '2024-05-15'), 'planted_out')
+        self.assertEqual(self.add_event('harvest', '2024-07-20'), 'harvesting')
+
+    def test_earlier_events_do_not_move_status_back(self):
+        self.assertEqual(self.add_event('harvest', '2024-07-20'), 'harvesting')
+        self.assertEqual(self.add_event('sowing', '2024-03-10'), 'harvesting')
+
+        PlantingCycle.objects.filter(pk=self.cycle.pk).update(status='finished')
+        self.assertEqual(self.add_event('harvest', '2024-08-01'), 'finished')
+
+    def test_reconcile_command_derives_status_from_events(self):
+        Event.objects.create(planting_cycle=self.cycle, event_type='sowing', event_date=date(2024, 3, 10))
+        Event.objects.create(planting_cycle=self.cycle, event_type='planting_out', event_date=date(2024, 5, 15))
+        PlantingCycle.objects.filter(pk=self.cycle.pk).update(status='planning')
+
+        call_command('reconcile_cycle_status', stdout=StringIO())
+        self.cycle.refresh_from_db()
+        self.assertEqual(self.cycle.status, 'planted_out')
+
+
+class DeltaResponseTests(GardenTestCase):
+    PLANT_KEYS = {
+        'id', 'cycle_count', 'latest_cycle_id', 'latest_cycle_year',
+        'latest_cycle_status', 'latest_cycle_status_display',
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.plant = Plant.objects.create(name='Bohne')
+        PlantingCycle.objects.create(plant=self.plant, year=2023)
+        self.cycle = PlantingCycle.objects.create(plant=self.plant, year=2024)
+
+    def assert_delta(self, data, changed):
+        self.assertEqual(set(data), {*changed, 'cycle', 'plant'})
+        self.assertNotIn('events', data['cycle'])
+        self.assertNotIn('tasks', data['cycle'])
+        self.assertEqual(data['cycle']['id'], self.cycle.id)
+        self.assertEqual(set(data['plant']), self.PLANT_KEYS)
+        self.assertEqual(data['plant']['id'], self.plant.id)
+        self.assertEqual(data['plant']['cycle_count'], 2)
+        self.assertEqual(data['plant']['latest_cycle_id'], self.cycle.id)
+
+    def test_add_event_returns_event_tasks_and_counts(self):
+        response = self.client.post(
+            f'/api/cycles/{self.cycle.id}/add_event/?delta=true',
+            {'event_type': 'sowing', 'event_date': date.today().isoformat()}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assert_delta(data, {'event', 'tasks'})
+        self.assertEqual(data['event']['event_type'], 'sowing')
+        self.assertTrue(data['tasks'])
+        self.assertEqual(
+            sorted(task['id'] for task in data['tasks']),
+            sorted(Task.objects.filter(source_event_id=data['event']['id']).values_list('id', flat=True))
+        )
+        self.assertEqual(data['cycle']['status'], 'sowing')
+        self.assertEqual(data['cycle']['event_count'], 1)
+        self.assertEqual(data['cycle']['task_count'], len(data['tasks']))
+        self.assertEqual(data['plant']['latest_cycle_status'], 'sowing')
+        self.assertEqual(data['plant']['latest_cycle_status_display'], 'Säen')
+
+    def test_add_and_toggle_task(self):
+        response = self.client.post(
+            f'/api/cycles/{self.cycle.id}/add_task/?delta=true', {'title': 'Stangen setzen'}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assert_delta(data, {'task'})
+        self.assertEqual(data['cycle']['task_count'], 1)
+
+        response = self.client.post(f'/api/tasks/{data["task"]["id"]}/toggle_complete/?delta=true')
+        data = response.json()
+        self.assert_delta(data, {'task'})
+        self.assertTrue(data['task']['completed'])
+
+    def test_delete_task_returns_counts_instead_of_204(self):
+        task = Task.objects.create(planting_cycle=self.cycle, title='Gießen')
+        response = self.client.delete(f'/api/tasks/{task.id}/?delta=true')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assert_delta(data, {'deleted'})
+        self.assertEqual(data['deleted'], {'task': task.id})
+        self.assertEqual(data['cycle']['task_count'], 0)
+
+    def test_task_without_cycle_has_no_cycle_or_plant(self):
+        task = Task.objects.create(title='Werkzeug schärfen')
+        data = self.client.post(f'/api/tasks/{task.id}/toggle_complete/?delta=1').json()
+        self.assertEqual(set(data), {'task', 'cycle', 'plant'})
+        self.assertIsNone(data['cycle'])
+        self.assertIsNone(data['plant'])
+
+    def test_without_delta_responses_are_unchanged(self):
+        task = Task.objects.create(planting_cycle=self.cycle, title='Gießen')
+        data = self.client.post(f'/api/tasks/{task.id}/toggle_complete/').json()
+        self.assertEqual(data['id'], task.id)
+        self.assertNotIn('cycle', data)
+        self.assertEqual(self.client.delete(f'/api/tasks/{task.id}/').status_code, 204)
+
+
+class LookupTests(GardenTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tomato = Plant.objects.create(name='Tomate', variety='Ochsenherz')
+        self.cycles = [PlantingCycle.objects.create(plant=self.tomato, year=year) for year in (2023, 2024)]
+        self.basil = Plant.objects.create(name='Basilikum')
+
+    def get(self, query=''):
+        return self.client.get(f'/api/lookup/{query}')
+
+    def test_rows_per_cycle_and_plants_without_cycle(self):
+        data = self.get().json()
+        self.assertEqual(data['columns'], ['id', 'plant', 'plant_name', 'plant_variety', 'year', 'status'])
+        self.assertEqual(data['rows'], [
+            [None, self.basil.id, 'Basilikum', '', None, None],
+            [self.cycles[1].id, self.tomato.id, 'Tomate', 'Ochsenherz', 2024, 'planning'],
+            [self.cycles[0].id, self.tomato.id, 'Tomate', 'Ochsenherz', 2023, 'planning'],
+        ])
+
+    def test_year_filter_keeps_plants_without_matching_cycle(self):
+        rows = self.get('?year=2023').json()['rows']
+        self.assertEqual(
+            [(row[0], row[1]) for row in rows],
+            [(None, self.basil.id), (self.cycles[0].id, self.tomato.id)]
+        )
+
+    def test_non_numeric_year_is_rejected(self):
+        self.assertEqual(self.get('?year=abc').status_code, 400)
+
+    def test_new_cycle_appears_after_write(self):
+        self.assertEqual(self.get().json()['rows'][0][0], None)
+        cycle = PlantingCycle.objects.create(plant=self.basil, year=2024)
+        self.assertEqual(self.get().json()['rows'][0][:2], [cycle.id, self.basil.id])
+
+
+class GroupedTaskTests(GardenTestCase):
+    def setUp(self):
+        super().setUp()
+        today = timezone.now().date()
+        self.overdue = [
+            Task.objects.create(title=f'Überfällig {days}', due_date=today - timedelta(days=days))
+            for days in (3, 1)
+        ]
+        self.today = Task.objects.create(title='Heute', due_date=today, priority='high')
+        self.later = [
+            Task.objects.create(title='Später', due_date=today + timedelta(days=30)),
+            Task.objects.create(title='Ohne Datum'),
+        ]
+        self.done = Task.objects.create(title='Erledigt', due_date=today - timedelta(days=5), completed=True)
+
+    def get(self, query=''):
+        return self.client.get(f'/api/tasks/grouped/{query}')
+
+    def ids(self, group):
+        return [task['id'] for task in group['results']]
+
+    def test_counts_and_groups(self):
+        data = self.get().json()
+        self.assertEqual(data['counts'], {
+            'overdue': 2, 'today': 1, 'week': 0, 'later': 2, 'done': 1, 'total': 6,
+        })
+        groups = {group['key']: group for group in data['groups']}
+        self.assertEqual(list(groups), ['overdue', 'today', 'week', 'later', 'done'])
+        self.assertEqual(groups['overdue']['label'], 'Überfällig')
+        self.assertEqual(self.ids(groups['overdue']), [task.id for task in self.overdue])
+        self.assertEqual(self.ids(groups['today']), [self.today.id])
+        self.assertEqual(self.ids(groups['later']), [task.id for task in self.later])
+        self.assertEqual(self.ids(groups['done']), [self.done.id])
+
+    def test_selected_groups_and_limit(self):
+        data = self.get('?groups=overdue,later&limit=1').json()
+        self.assertEqual([group['key'] for group in data['groups']], ['overdue', 'later'])
+        self.assertEqual([group['count'] for group in data['groups']], [2, 2])
+        self.assertEqual([self.ids(group) for group in data['groups']], [[self.overdue[0].id], [self.later[0].id]])
+
+    def test_list_filters_apply(self):
+        data = self.get('?priority=high').json()
+        self.assertEqual(data['counts']['total'], 1)
+        self.assertEqual(sum(len(group['results']) for group in data['groups']), 1)
+
+    def test_invalid_parameters_are_rejected(self):
+        self.assertEqual(self.get('?groups=overdue,someday').status_code, 400)
+        self.assertEqual(self.get('?limit=abc').status_code, 400)
@@ -5,7 +5,12 @@ from .views import (
     PlantingCycleViewSet,
     EventViewSet,
     TaskViewSet,
-    DashboardViewSet
+    DashboardViewSet,
+    AnalyticsViewSet,
+    LookupViewSet,
+    SyncViewSet,
+    ExportViewSet,
+    ImportViewSet
 )
 
 router = DefaultRouter()
@@ -14,6 +19,11 @@ router.register(r'cycles', PlantingCycleViewSet, basename='plantingcycle')
 router.register(r'events', EventViewSet, basename='event')
 router.register(r'tasks', TaskViewSet, basename='task')
 router.register(r'dashboard', DashboardViewSet, basename='dashboard')
+router.register(r'analytics', AnalyticsViewSet, basename='analytics')
+router.register(r'lookup', LookupViewSet, basename='lookup')
+router.register(r'sync', SyncViewSet, basename='sync')
+router.register(r'export', ExportViewSet, basename='export')
+router.register(r'import', ImportViewSet, basename='import')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,25 +1,73 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
-from django.db.models import Count, Q, Sum
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Prefetch, Q, Sum
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from datetime import timedelta
 
-from .models import Plant, PlantingCycle, Event, Task
+from .analytics import GROUPINGS, TIMELINE_BUCKETS, event_timeline, rollup_totals
+from .conditional import ConditionalGetMixin
+from .deltas import cycle_delta, wants_delta
+from .export import EXPORT_MODELS, iter_csv, iter_ndjson
+from .importer import ENCODING_ERROR, IMPORT_MODELS, GardenImporter, open_text, read_csv, read_ndjson
+from .instrumentation import request_stats, reset_request_stats
+from .lookup import cycle_lookup
+from .models import Plant, PlantingCycle, Event, EventRollup, Task
+from .pagination import SelectablePaginationMixin
+from .response_cache import ResponseCacheMixin, response_cache_stats
+from .search import search_plants
+from .sparse_fields import FieldSelectionMixin
+from .sync import InvalidToken, changes_since
+from .task_groups import TASK_GROUP_LABELS, task_groups
 from .serializers import (
     PlantSerializer,
     PlantListSerializer,
     PlantingCycleSerializer,
     EventSerializer,
-    TaskSerializer
+    TaskSerializer,
+    TaskBulkSerializer
 )
 
 
-class PlantViewSet(viewsets.ModelViewSet):
+def plan_cycles(queryset, selections, with_plant=True):
+    """
+    Zyklen-Queryset mit genau den Beziehungen, die PlantingCycleSerializer
+    bei den Feldauswahlen selections ausgibt
+    """
+    def wanted(name):
+        return any(PlantingCycleSerializer.selects(selection, name) for selection in selections)
+
+    if with_plant and (wanted('plant_name') or wanted('plant_variety')):
+        queryset = queryset.select_related('plant')
+    prefetch = [name for name in ('events', 'tasks') if wanted(name)]
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+
+    # Anzahl ohne die Zeilen selbst: Subquery statt Prefetch
+    count_events = wanted('event_count') and not wanted('events')
+    count_tasks = wanted('task_count') and not wanted('tasks')
+    if count_events or count_tasks:
+        queryset = queryset.with_counts(events=count_events, tasks=count_tasks)
+    return queryset
+
+
+class PlantViewSet(FieldSelectionMixin, ResponseCacheMixin, viewsets.ModelViewSet):
     """ViewSet für Pflanzen"""
-    queryset = Plant.objects.all().prefetch_related('cycles', 'cycles__events', 'cycles__tasks')
+    conditional_models = (Plant, PlantingCycle, Event, Task)
+    queryset = Plant.objects.all()
     serializer_class = PlantSerializer
 
+    # Spalten, die PlantListSerializer tatsächlich ausliest
+    LIST_FIELDS = ('id', 'name', 'variety', 'created_at', 'updated_at')
+
+    # Felder, die with_cycle_summary() liefert
+    SUMMARY_FIELDS = ('cycle_count', 'latest_cycle_year', 'latest_cycle_status')
+
     def get_serializer_class(self):
         """Verwende vereinfachten Serializer für list"""
         if self.action == 'list':
@@ -30,36 +78,68 @@ class PlantViewSet(viewsets.ModelViewSet):
         """Filter für Pflanzen"""
         queryset = super().get_queryset()
 
-        # Suche
+        # Volltextsuche (nach Relevanz sortiert)
         search = self.request.query_params.get('search', None)
         if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) |
-                Q(variety__icontains=search) |
-                Q(seed_source__icontains=search)
-            )
+            queryset = search_plants(queryset, search)
 
         # Filter nach Jahr
         year = self.request.query_params.get('year', None)
         if year:
             queryset = queryset.filter(cycles__year=year).distinct()
 
-        return queryset.annotate(cycle_count=Count('cycles'))
+        return self.apply_fetch_plan(queryset)
+
+    def apply_fetch_plan(self, queryset):
+        """Prefetch und Spaltenauswahl passend zur Action und Feldauswahl"""
+        selection = self.field_selection
+
+        if self.action == 'list':
+            # Liste braucht nur Annotationen, keine Zyklen/Events/Tasks
+            queryset = queryset.only(*self.LIST_FIELDS)
+            if any(PlantListSerializer.selects(selection, name) for name in self.SUMMARY_FIELDS):
+                queryset = queryset.with_cycle_summary()
+            return queryset
+
+        if self.action == 'cycles_detail':
+            return queryset.only('id', 'name', 'variety').prefetch_related(
+                Prefetch('cycles', queryset=plan_cycles(PlantingCycle.objects.all(), [selection], with_plant=False))
+            )
+
+        if self.action == 'destroy':
+            return queryset.only('id')
+
+        # cycles und latest_cycle kommen aus denselben vorgeladenen Zyklen
+        selections = [
+            selection.nested(name) for name in ('cycles', 'latest_cycle')
+            if PlantSerializer.selects(selection, name)
+        ]
+        if selections:
+            return queryset.prefetch_related(
+                Prefetch('cycles', queryset=plan_cycles(PlantingCycle.objects.all(), selections, with_plant=False))
+            )
+        if PlantSerializer.selects(selection, 'cycle_count'):
+            return queryset.with_cycle_summary()
+        return queryset
 
     @action(detail=True, methods=['get'])
     def cycles_detail(self, request, pk=None):
         """Detaillierte Zyklus-Informationen für eine Pflanze"""
         plant = self.get_object()
         cycles = plant.cycles.all()
-        serializer = PlantingCycleSerializer(cycles, many=True)
+        serializer = PlantingCycleSerializer(cycles, many=True, field_selection=self.field_selection)
         return Response(serializer.data)
 
 
-class PlantingCycleViewSet(viewsets.ModelViewSet):
+class PlantingCycleViewSet(FieldSelectionMixin, ResponseCacheMixin, viewsets.ModelViewSet):
     """ViewSet für Anbau-Zyklen"""
-    queryset = PlantingCycle.objects.all().select_related('plant').prefetch_related('events', 'tasks')
+    conditional_models = (Plant, PlantingCycle, Event, Task)
+    queryset = PlantingCycle.objects.all()
     serializer_class = PlantingCycleSerializer
 
+    # Actions, die Zyklen mit PlantingCycleSerializer ausgeben
+    SERIALIZED_ACTIONS = ('list', 'retrieve', 'update', 'partial_update')
+
     def get_queryset(self):
         """Filter für Anbau-Zyklen"""
         queryset = super().get_queryset()
@@ -79,8 +159,23 @@ class PlantingCycleViewSet(viewsets.ModelViewSet):
         if plant:
             queryset = queryset.filter(plant_id=plant)
 
+        # Mit ?delta=true wird der Zyklus nach dem Speichern kompakt neu geladen
+        if self.action in self.SERIALIZED_ACTIONS and not wants_delta(self.request):
+            queryset = plan_cycles(queryset, [self.field_selection])
         return queryset
 
+    def update(self, request, *args, **kwargs):
+        """Mit ?delta=true nur Zyklus und Pflanzen-Kennzahlen zurückgeben"""
+        if not wants_delta(request):
+            return super().update(request, *args, **kwargs)
+        cycle = self.get_object()
+        serializer = self.get_serializer(cycle, data=request.data, partial=kwargs.get('partial', False))
+
+        if serializer.is_valid():
+            serializer.save()
+            return Response(cycle_delta(cycle.id))
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
     @action(detail=True, methods=['post'])
     def add_event(self, request, pk=None):
         """Event zu einem Zyklus hinzufügen"""
@@ -93,7 +188,14 @@ class PlantingCycleViewSet(viewsets.ModelViewSet):
         serializer = EventSerializer(data=data)
 
         if serializer.is_valid():
-            serializer.save()
+            event = serializer.save()
+            if wants_delta(request):
+                # Automatisch angelegte Tasks und ein evtl. weitergeschalteter Status
+                tasks = TaskSerializer(Task.objects.filter(source_event=event), many=True)
+                return Response(
+                    cycle_delta(cycle.id, event=serializer.data, tasks=tasks.data),
+                    status=status.HTTP_201_CREATED
+                )
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -110,15 +212,22 @@ class PlantingCycleViewSet(viewsets.ModelViewSet):
 
         if serializer.is_valid():
             serializer.save()
+            if wants_delta(request):
+                return Response(cycle_delta(cycle.id, task=serializer.data), status=status.HTTP_201_CREATED)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(FieldSelectionMixin, ResponseCacheMixin, SelectablePaginationMixin, viewsets.ModelViewSet):
     """ViewSet für Events"""
-    queryset = Event.objects.all().select_related('planting_cycle', 'planting_cycle__plant')
+    # ?plant= und timeline filtern über planting_cycle__plant_id
+    conditional_models = (Event, PlantingCycle)
+    cached_actions = ('list', 'retrieve', 'timeline')
+    queryset = Event.objects.all()
     serializer_class = EventSerializer
 
+    BULK_MAX_EVENTS = 1000
+
     def get_queryset(self):
         """Filter für Events"""
         queryset = super().get_queryset()
@@ -128,6 +237,11 @@ class EventViewSet(viewsets.ModelViewSet):
         if cycle:
             queryset = queryset.filter(planting_cycle_id=cycle)
 
+        # Filter nach Pflanze (alle Zyklen)
+        plant = self.request.query_params.get('plant', None)
+        if plant:
+            queryset = queryset.filter(planting_cycle__plant_id=plant)
+
         # Filter nach Event-Typ
         event_type = self.request.query_params.get('type', None)
         if event_type:
@@ -144,35 +258,88 @@ class EventViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    @action(detail=False, methods=['get'])
+    def timeline(self, request):
+        """Events pro Tag/Woche/Monat und Typ zusammengefasst (?bucket=, Filter wie list)"""
+        bucket = request.query_params.get('bucket', 'week')
+        if bucket not in TIMELINE_BUCKETS:
+            return Response(
+                {'bucket': f'Erlaubt: {", ".join(TIMELINE_BUCKETS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return self.cached_response(self.timeline_response, request, bucket)
+
+    def timeline_response(self, request, bucket):
+        return Response(event_timeline(self.get_queryset(), bucket))
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Mehrere Events in einer Transaktion anlegen"""
+        if not isinstance(request.data, list):
+            return Response(
+                {'detail': 'Erwartet eine Liste von Events.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Alle referenzierten Zyklen mit einer Query laden
+        cycle_ids = set()
+        for item in request.data:
+            try:
+                cycle_ids.add(int(item.get('planting_cycle')))
+            except (AttributeError, TypeError, ValueError):
+                pass
+        cycles = PlantingCycle.objects.in_bulk(cycle_ids)
+
+        serializer = EventSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=self.BULK_MAX_EVENTS,
+            context={**self.get_serializer_context(), 'planting_cycles': cycles}
+        )
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class TaskViewSet(viewsets.ModelViewSet):
+
+class TaskViewSet(FieldSelectionMixin, ResponseCacheMixin, SelectablePaginationMixin, viewsets.ModelViewSet):
     """ViewSet für Tasks"""
-    queryset = Task.objects.all().select_related('planting_cycle', 'planting_cycle__plant')
+    conditional_models = (Task,)
+    queryset = Task.objects.all()
     serializer_class = TaskSerializer
+    cached_actions = ('list', 'retrieve', 'grouped')
+
+    # Aufgaben pro Gruppe in grouped (Standard und Obergrenze)
+    GROUP_LIMIT = 20
+    MAX_GROUP_LIMIT = 500
 
     def get_queryset(self):
         """Filter für Tasks"""
-        queryset = super().get_queryset()
+        return self.filter_tasks(super().get_queryset(), self.request.query_params)
 
+    @staticmethod
+    def filter_tasks(queryset, params):
+        """Wendet die Task-Filter aus Query-Parametern oder einem Dict an"""
         # Filter nach completed Status
-        completed = self.request.query_params.get('completed', None)
+        completed = params.get('completed', None)
         if completed is not None:
-            completed_bool = completed.lower() in ['true', '1', 'yes']
+            completed_bool = str(completed).lower() in ['true', '1', 'yes']
             queryset = queryset.filter(completed=completed_bool)
 
         # Filter nach Zyklus
-        cycle = self.request.query_params.get('cycle', None)
+        cycle = params.get('cycle', None)
         if cycle:
             queryset = queryset.filter(planting_cycle_id=cycle)
 
         # Filter nach Priorität
-        priority = self.request.query_params.get('priority', None)
+        priority = params.get('priority', None)
         if priority:
             queryset = queryset.filter(priority=priority)
 
         # Nur überfällige Tasks
-        overdue = self.request.query_params.get('overdue', None)
-        if overdue and overdue.lower() in ['true', '1', 'yes']:
+        overdue = params.get('overdue', None)
+        if overdue and str(overdue).lower() in ['true', '1', 'yes']:
             today = timezone.now().date()
             queryset = queryset.filter(
                 completed=False,
@@ -181,6 +348,56 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Mehrere Tasks mit einem UPDATE ändern (per ids oder filter)"""
+        serializer = TaskBulkSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+
+        if 'ids' in data:
+            tasks = Task.objects.filter(id__in=data['ids'])
+        else:
+            tasks = self.filter_tasks(Task.objects.all(), data['filter'])
+
+        if data['action'] == 'complete':
+            updated = tasks.complete()
+        elif data['action'] == 'uncomplete':
+            updated = tasks.uncomplete()
+        elif data['action'] == 'reschedule':
+            updated = tasks.reschedule(data['due_date'])
+        else:
+            updated = tasks.reprioritize(data['priority'])
+
+        return Response({'updated': updated})
+
+    @action(detail=False, methods=['get'])
+    def grouped(self, request):
+        """Aufgaben nach Fälligkeit gruppiert mit Anzahl pro Gruppe (Filter wie list)"""
+        keys = [key for key in request.query_params.get('groups', '').split(',') if key]
+        unknown = [key for key in keys if key not in TASK_GROUP_LABELS]
+        if unknown:
+            return Response(
+                {'groups': f'Unbekannte Gruppe: {", ".join(unknown)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = int(request.query_params.get('limit', self.GROUP_LIMIT))
+        except ValueError:
+            return Response({'limit': 'Zahl erwartet'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(0, min(limit, self.MAX_GROUP_LIMIT))
+        return self.cached_response(self.grouped_response, request, keys, limit)
+
+    def grouped_response(self, request, keys, limit):
+        today = timezone.now().date()
+        # Gruppen brauchen keine Zyklen/Pflanzen, nur die gefilterten Tasks
+        queryset = self.filter_tasks(Task.objects.all(), request.query_params)
+        counts, groups = task_groups(queryset, today, keys, limit)
+        for group in groups:
+            group['results'] = self.get_serializer(group['results'], many=True).data
+        return Response({'counts': counts, 'groups': groups})
+
     @action(detail=True, methods=['post'])
     def toggle_complete(self, request, pk=None):
         """Toggle completed Status"""
@@ -188,74 +405,254 @@ class TaskViewSet(viewsets.ModelViewSet):
         task.completed = not task.completed
         task.save()
         serializer = self.get_serializer(task)
+        if wants_delta(request):
+            return Response(cycle_delta(task.planting_cycle_id, task=serializer.data))
         return Response(serializer.data)
 
+    def destroy(self, request, *args, **kwargs):
+        """Mit ?delta=true 200 mit den Zyklus-Kennzahlen statt 204"""
+        if not wants_delta(request):
+            return super().destroy(request, *args, **kwargs)
+        task = self.get_object()
+        task_id, cycle_id = task.id, task.planting_cycle_id
+        self.perform_destroy(task)
+        return Response(cycle_delta(cycle_id, deleted={'task': task_id}))
+
 
-class DashboardViewSet(viewsets.ViewSet):
+class DashboardViewSet(ConditionalGetMixin, viewsets.ViewSet):
     """Dashboard mit aggregierten Daten"""
+    conditional_models = (Plant, PlantingCycle, Event, Task)
+    # cache_stats und request_stats ändern sich ohne Datenänderung
+    conditional_actions = ('stats',)
+
+    STATS_KEY = 'plants:dashboard:{}'
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """Dashboard-Statistiken"""
-        current_year = timezone.now().year
+        """Dashboard-Statistiken (gecacht unter dem ETag)"""
         today = timezone.now().date()
+        # Der ETag enthält das Datum und die Änderungsstände aus initial()
+        etag, _ = self.conditional_state
+        data = cache.get_or_set(
+            self.STATS_KEY.format(etag.strip('"')),
+            lambda: self.build_stats(today),
+            timeout=settings.PLANTS_CACHE_TIMEOUT
+        )
+        return Response(data)
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        """Hit/Miss-Zähler des Response-Caches (nur für Admins)"""
+        return Response(response_cache_stats())
+
+    @action(detail=False, methods=['get', 'delete'], permission_classes=[IsAdminUser])
+    def request_stats(self, request):
+        """Query-Anzahl und Laufzeiten pro Route (nur für Admins); DELETE setzt zurück"""
+        if request.method == 'DELETE':
+            reset_request_stats()
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response({
+            'enabled': settings.PLANTS_INSTRUMENTATION,
+            'routes': request_stats(),
+        })
+
+    def build_stats(self, today):
+        """Baut die Dashboard-Daten mit einer Aggregat-Query pro Tabelle"""
+        current_year = today.year
+        last_30_days = today - timedelta(days=30)
+        next_week = today + timedelta(days=7)
 
         # Aktuelle Zyklen
-        current_cycles = PlantingCycle.objects.filter(
-            year=current_year
-        ).exclude(status='finished')
+        current_filter = Q(year=current_year) & ~Q(status='finished')
+        current_cycles = PlantingCycle.objects.filter(current_filter)
 
         # Aufgaben
-        open_tasks = Task.objects.filter(completed=False)
-        overdue_tasks = open_tasks.filter(
-            due_date__isnull=False,
-            due_date__lt=today
-        )
-        upcoming_tasks = open_tasks.filter(
+        open_filter = Q(completed=False)
+        overdue_filter = open_filter & Q(due_date__isnull=False, due_date__lt=today)
+        upcoming_filter = open_filter & Q(
             due_date__isnull=False,
             due_date__gte=today,
-            due_date__lte=today + timedelta(days=7)
+            due_date__lte=next_week
         )
 
-        # Ereignisse der letzten 30 Tage
-        recent_events = Event.objects.filter(
-            event_date__gte=today - timedelta(days=30)
+        plant_stats = Plant.objects.aggregate(
+            total_plants=Count('id', distinct=True),
+            current_cycles=Count(
+                'cycles',
+                filter=Q(cycles__year=current_year) & ~Q(cycles__status='finished')
+            ),
         )
-
-        # Ernten der letzten 30 Tage
-        recent_harvests = Event.objects.filter(
-            event_type='harvest',
-            event_date__gte=today - timedelta(days=30)
-        ).aggregate(
-            count=Count('id'),
-            total_quantity=Sum('quantity')
+        task_stats = Task.objects.aggregate(
+            open_tasks=Count('id', filter=open_filter),
+            overdue_tasks=Count('id', filter=overdue_filter),
+        )
+        # Ereignisse und Ernten der letzten 30 Tage
+        harvest_filter = Q(event_type='harvest')
+        event_stats = Event.objects.filter(event_date__gte=last_30_days).aggregate(
+            recent_events=Count('id'),
+            harvest_count=Count('id', filter=harvest_filter),
+            harvest_quantity=Sum('quantity', filter=harvest_filter),
         )
 
-        data = {
+        cycles = current_cycles.select_related('plant').prefetch_related('events', 'tasks')[:10]
+
+        return {
             'current_year': current_year,
             'stats': {
-                'total_plants': Plant.objects.count(),
-                'current_cycles': current_cycles.count(),
-                'open_tasks': open_tasks.count(),
-                'overdue_tasks': overdue_tasks.count(),
-                'recent_events': recent_events.count(),
+                'total_plants': plant_stats['total_plants'],
+                'current_cycles': plant_stats['current_cycles'],
+                'open_tasks': task_stats['open_tasks'],
+                'overdue_tasks': task_stats['overdue_tasks'],
+                'recent_events': event_stats['recent_events'],
             },
-            'cycles': PlantingCycleSerializer(
-                current_cycles[:10],
-                many=True
-            ).data,
+            'cycles': PlantingCycleSerializer(cycles, many=True).data,
+            # Wichtigste zuerst, aus dem Index (completed, priority_rank, due_date)
             'upcoming_tasks': TaskSerializer(
-                upcoming_tasks[:10],
+                Task.objects.filter(upcoming_filter).order_by('completed', 'priority_rank', 'due_date')[:10],
                 many=True
             ).data,
             'overdue_tasks': TaskSerializer(
-                overdue_tasks[:10],
+                Task.objects.filter(overdue_filter).order_by('completed', 'priority_rank', 'due_date')[:10],
                 many=True
             ).data,
             'recent_harvests': {
-                'count': recent_harvests['count'] or 0,
-                'total_quantity': float(recent_harvests['total_quantity'] or 0)
+                'count': event_stats['harvest_count'] or 0,
+                'total_quantity': float(event_stats['harvest_quantity'] or 0)
             }
         }
 
+
+class AnalyticsViewSet(ConditionalGetMixin, viewsets.ViewSet):
+    """Auswertungen aus den vorberechneten Monatssummen (EventRollup)"""
+    conditional_models = (Plant, PlantingCycle, Event, EventRollup)
+
+    DEFAULT_EVENT_TYPES = ['harvest', 'watering']
+
+    def list(self, request):
+        """Summen gruppiert nach group_by (plant, variety, year, month)"""
+        group_by = [g for g in request.query_params.get('group_by', 'year').split(',') if g]
+        unknown = [g for g in group_by if g not in GROUPINGS]
+        if unknown:
+            return Response(
+                {'group_by': f'Unbekannte Gruppierung: {", ".join(unknown)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        year = request.query_params.get('year', None)
+        if year and not year.isdigit():
+            return Response({'year': 'Jahr als Zahl erwartet'}, status=status.HTTP_400_BAD_REQUEST)
+        plant = request.query_params.get('plant', None)
+        if plant and not plant.isdigit():
+            return Response({'plant': 'Pflanzen-ID als Zahl erwartet'}, status=status.HTTP_400_BAD_REQUEST)
+
+        event_types = request.query_params.get('type', None)
+        event_types = event_types.split(',') if event_types else self.DEFAULT_EVENT_TYPES
+
+        rows = rollup_totals(
+            group_by,
+            event_types=event_types,
+            year=int(year) if year else None,
+            plant=int(plant) if plant else None
+        )
+        return Response(list(rows))
+
+
+class LookupViewSet(ConditionalGetMixin, viewsets.ViewSet):
+    """Pflanzen/Zyklen als Tupel für Auswahlfelder (siehe lookup.py)"""
+    # Events und Tasks ändern die Liste nicht
+    conditional_models = (Plant, PlantingCycle)
+
+    LOOKUP_KEY = 'plants:lookup:{}'
+
+    def list(self, request):
+        year = request.query_params.get('year', None)
+        if year and not year.isdigit():
+            return Response({'year': 'Jahr als Zahl erwartet'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Der ETag enthält die Änderungsstände von Plant und PlantingCycle
+        etag, _ = self.conditional_state
+        data = cache.get_or_set(
+            self.LOOKUP_KEY.format(etag.strip('"')),
+            lambda: cycle_lookup(int(year) if year else None),
+            timeout=settings.PLANTS_LOOKUP_CACHE_TIMEOUT
+        )
         return Response(data)
+
+
+class SyncViewSet(viewsets.ViewSet):
+    """Änderungen seit einem Sync-Token für Clients mit lokalem Cache (siehe sync.py)"""
+
+    def list(self, request):
+        try:
+            changes = changes_since(request.query_params.get('since', None))
+        except InvalidToken:
+            return Response(
+                {'since': 'Ungültiges Sync-Token, ohne since neu abgleichen'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(changes)
+
+
+class ExportViewSet(viewsets.ViewSet):
+    """Streaming-Export der kompletten Gartenhistorie"""
+
+    @action(detail=False, methods=['get'])
+    def ndjson(self, request):
+        """Alle (oder per ?model= gewählte) Tabellen als NDJSON"""
+        models = [m for m in request.query_params.get('model', '').split(',') if m]
+        unknown = [m for m in models if m not in EXPORT_MODELS]
+        if unknown:
+            return Response(
+                {'model': f'Unbekannte Tabelle: {", ".join(unknown)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return self.stream(iter_ndjson(models), 'application/x-ndjson', 'ndjson')
+
+    @action(detail=False, methods=['get'])
+    def csv(self, request):
+        """Eine Tabelle (?model=, Standard events) als CSV"""
+        model = request.query_params.get('model', 'events')
+        if model not in EXPORT_MODELS:
+            return Response(
+                {'model': f'Unbekannte Tabelle: {model}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return self.stream(iter_csv(model), 'text/csv; charset=utf-8', 'csv', model)
+
+    def stream(self, lines, content_type, extension, name=None):
+        response = StreamingHttpResponse(lines, content_type=content_type)
+        parts = ['garden-export', timezone.now().date().isoformat(), name]
+        filename = '-'.join(p for p in parts if p) + f'.{extension}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class ImportViewSet(viewsets.ViewSet):
+    """Massenimport aus einer hochgeladenen NDJSON- oder CSV-Datei"""
+    parser_classes = [MultiPartParser]
+
+    def create(self, request):
+        """Datei importieren (file, model bei CSV, dry_run)"""
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'file': 'Keine Datei hochgeladen.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        model = request.data.get('model') or None
+        if model is not None and model not in IMPORT_MODELS:
+            return Response({'model': f'Unbekannte Tabelle: {model}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        is_csv = upload.name.lower().endswith('.csv')
+        if is_csv and model is None:
+            return Response({'model': 'Für CSV Pflichtfeld.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = str(request.data.get('dry_run', '')).lower() in ['true', '1', 'yes']
+        stream = open_text(upload)
+        records = read_csv(stream, model) if is_csv else read_ndjson(stream, model)
+        try:
+            summary = GardenImporter(dry_run=dry_run).run(records)
+        except UnicodeDecodeError:
+            # Erst beim Lesen erkannt, die Transaktion ist bereits zurückgerollt
+            return Response({'file': ENCODING_ERROR}, status=status.HTTP_400_BAD_REQUEST)
+
+        created = any(summary['created'].values()) and not dry_run
+        return Response(summary, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
@@ -24,17 +24,26 @@ export const cycleAPI = {
   getAll: (params) => api.get('/cycles/', { params }),
   get: (id) => api.get(`/cycles/${id}/`),
   create: (data) => api.post('/cycles/', data),
-  update: (id, data) => api.put(`/cycles/${id}/`, data),
+  // params { delta: true }: Antwort nur mit geändertem Objekt und Kennzahlen
+  update: (id, data, params) => api.put(`/cycles/${id}/`, data, { params }),
+  patch: (id, data, params) => api.patch(`/cycles/${id}/`, data, { params }),
   delete: (id) => api.delete(`/cycles/${id}/`),
-  addEvent: (id, data) => api.post(`/cycles/${id}/add_event/`, data),
-  addTask: (id, data) => api.post(`/cycles/${id}/add_task/`, data)
+  addEvent: (id, data, params) => api.post(`/cycles/${id}/add_event/`, data, { params }),
+  addTask: (id, data, params) => api.post(`/cycles/${id}/add_task/`, data, { params })
 }
 
 // Events
 export const eventAPI = {
   getAll: (params) => api.get('/events/', { params }),
+  // Cursor-Pagination: ohne nextUrl erste Seite, sonst response.data.next
+  getFeed: (params, nextUrl) => nextUrl
+    ? api.get(nextUrl)
+    : api.get('/events/', { params: { ...params, pagination: 'cursor' } }),
   get: (id) => api.get(`/events/${id}/`),
   create: (data) => api.post('/events/', data),
+  bulkCreate: (events) => api.post('/events/bulk/', events),
+  // Serverseitig zusammengefasst, params: bucket (day/week/month) + Filter wie getAll
+  getTimeline: (params) => api.get('/events/timeline/', { params }),
   update: (id, data) => api.put(`/events/${id}/`, data),
   delete: (id) => api.delete(`/events/${id}/`)
 }
@@ -42,11 +51,17 @@ export const eventAPI = {
 // Tasks
 export const taskAPI = {
   getAll: (params) => api.get('/tasks/', { params }),
+  getFeed: (params, nextUrl) => nextUrl
+    ? api.get(nextUrl)
+    : api.get('/tasks/', { params: { ...params, pagination: 'cursor' } }),
   get: (id) => api.get(`/tasks/${id}/`),
   create: (data) => api.post('/tasks/', data),
   update: (id, data) => api.put(`/tasks/${id}/`, data),
-  delete: (id) => api.delete(`/tasks/${id}/`),
-  toggleComplete: (id) => api.post(`/tasks/${id}/toggle_complete/`)
+  delete: (id, params) => api.delete(`/tasks/${id}/`, { params }),
+  toggleComplete: (id, params) => api.post(`/tasks/${id}/toggle_complete/`, null, { params }),
+  // Nach Fälligkeit gruppiert: { counts, groups }, params: groups, limit + Filter wie getAll
+  getGrouped: (params) => api.get('/tasks/grouped/', { params }),
+  bulk: (data) => api.post('/tasks/bulk/', data)
 }
 
 // Dashboard
@@ -54,4 +69,25 @@ export const dashboardAPI = {
   getStats: () => api.get('/dashboard/stats/')
 }
 
+// Auswertungen
+export const analyticsAPI = {
+  get: (params) => api.get('/analytics/', { params })
+}
+
+// Auswahllisten für Formulare: { columns, rows }, eine Zeile pro Zyklus,
+// Pflanzen ohne Zyklus (im Jahr) mit id/year/status = null
+export const lookupAPI = {
+  getCycles: (params) => api.get('/lookup/', { params })
+}
+
+// Tupel einer Lookup-Antwort als Objekte mit den Spaltennamen
+export const lookupRecords = ({ columns, rows }) =>
+  rows.map(row => Object.fromEntries(columns.map((column, i) => [column, row[i]])))
+
+// Abgleich für einen lokalen Cache: ohne since alles, danach mit dem
+// letzten token nur Änderungen (deleted zuerst anwenden, bei reset Cache leeren)
+export const syncAPI = {
+  get: (since) => api.get('/sync/', { params: since ? { since } : {} })
+}
+
 export default api